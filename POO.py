@@ -5,6 +5,22 @@ Fecha: [Fecha]
 """
 
 import sys
+from array import array
+from collections import OrderedDict
+from itertools import count
+
+from clima_calendario import NOMBRES_DIAS, nombre_dia
+from clima_cuantiles import BosquejoCuantiles
+from clima_nucleo import CLASIFICADOR_CLIMA, calcular_promedio
+
+
+# Contador global de cambios: cada DiaClima creado o modificado recibe un
+# número nuevo, de modo que la versión de una semana cambia con cualquier día
+_VERSIONES = count(1)
+
+# Número de serie de cada SemanaClima, único durante todo el proceso (a
+# diferencia de id(), que puede repetirse cuando se libera una semana)
+_SERIALES = count(1)
 
 
 def safe_input(prompt: str):
@@ -31,19 +47,16 @@ class DiaClima:
     
     Atributos:
         _temperatura (float): Temperatura del día (encapsulado)
-        _dia_semana (str): Nombre del día de la semana
+        _numero_dia (int): Número del día; el nombre se obtiene de la tabla
+            compartida de clima_calendario en lugar de guardarse en cada objeto
+        _version (int): Número de cambio asignado en la última modificación
     """
     
-    # Diccionario de días de la semana
-    DIAS_SEMANA = {
-        1: "Lunes",
-        2: "Martes", 
-        3: "Miércoles",
-        4: "Jueves",
-        5: "Viernes",
-        6: "Sábado",
-        7: "Domingo"
-    }
+    # Solo se reservan los atributos, sin diccionario por instancia
+    __slots__ = ("_temperatura", "_numero_dia", "_version")
+    
+    # Diccionario de días de la semana (apunta a los nombres compartidos)
+    DIAS_SEMANA = {numero: nombre for numero, nombre in enumerate(NOMBRES_DIAS, 1)}
     
     def __init__(self, numero_dia, temperatura=None):
         """
@@ -55,7 +68,7 @@ class DiaClima:
         """
         self._temperatura = temperatura
         self._numero_dia = numero_dia
-        self._dia_semana = self.DIAS_SEMANA.get(numero_dia, f"Día {numero_dia}")
+        self._version = next(_VERSIONES)
     
     # Getter y Setter para temperatura (encapsulamiento)
     @property
@@ -76,13 +89,62 @@ class DiaClima:
         """
         try:
             self._temperatura = float(valor)
-        except (ValueError, TypeError):
+        except (ValueError, TypeError, OverflowError):
             raise ValueError("La temperatura debe ser un número válido")
+        self._version = next(_VERSIONES)
+    
+    @staticmethod
+    def convertir_lote(valores):
+        """
+        Convierte y valida en una sola pasada un lote de temperaturas crudas.
+        
+        Aplica la misma conversión que el setter de temperatura (float) a
+        cadenas, bytes o números, sin crear objetos ni pasar por la propiedad.
+        
+        Args:
+            valores (iterable): Temperaturas como str, bytes o números
+        
+        Returns:
+            tuple: (array de floats 'd', lista de índices no válidos). Las
+                posiciones no válidas quedan como NaN en el array.
+        """
+        valores = valores if isinstance(valores, (list, tuple)) else list(valores)
+        try:
+            # Camino rápido: todo el lote es válido y se convierte en C
+            return array("d", map(float, valores)), []
+        except (ValueError, TypeError, OverflowError):
+            pass
+        temperaturas = array("d", bytes(8 * len(valores)))
+        errores = []
+        for indice, valor in enumerate(valores):
+            try:
+                temperaturas[indice] = float(valor)
+            except (ValueError, TypeError, OverflowError):
+                temperaturas[indice] = float("nan")
+                errores.append(indice)
+        return temperaturas, errores
+    
+    @staticmethod
+    def desde_binario(datos, tipo="d"):
+        """
+        Camino confiable para fuentes binarias ya validadas: copia los bytes
+        directamente a un array sin validar cada elemento.
+        
+        Args:
+            datos (bytes-like): Temperaturas empaquetadas en el orden nativo
+            tipo (str): "d" para float64 o "f" para float32
+        
+        Returns:
+            array: Temperaturas del lote
+        """
+        temperaturas = array(tipo)
+        temperaturas.frombytes(datos)
+        return temperaturas
     
     @property
     def dia_semana(self):
         """Getter para el nombre del día de la semana."""
-        return self._dia_semana
+        return nombre_dia(self._numero_dia)
     
     @property
     def numero_dia(self):
@@ -97,8 +159,8 @@ class DiaClima:
             str: Información formateada del día
         """
         if self._temperatura is not None:
-            return f"{self._dia_semana}: {self._temperatura}°C"
-        return f"{self._dia_semana}: Temperatura no registrada"
+            return f"{self.dia_semana}: {self._temperatura}°C"
+        return f"{self.dia_semana}: Temperatura no registrada"
     
     def __str__(self):
         """Representación en string del objeto."""
@@ -112,11 +174,67 @@ class SemanaClima:
     
     Atributos:
         _dias (list): Lista de objetos DiaClima
+        _serial (int): Número de serie único de la semana (clave de caché)
+        clasificador (ClasificadorClima): Clasificador usado por clasificar_clima
     """
     
+    # Clasificador compartido; una subclase puede usar otros umbrales
+    clasificador = CLASIFICADOR_CLIMA
+    
     def __init__(self):
         """Constructor de la clase SemanaClima."""
         self._dias = []
+        self._serial = next(_SERIALES)
+    
+    @property
+    def version(self):
+        """
+        Identificador del estado de la semana: cambia al agregar, quitar o
+        reordenar días y al modificar la temperatura de cualquiera de ellos.
+        """
+        return tuple(dia._version for dia in self._dias)
+    
+    @classmethod
+    def desde_temperaturas(cls, temperaturas):
+        """
+        Crea una semana a partir de temperaturas consecutivas desde el Lunes.
+        
+        Args:
+            temperaturas (iterable): Temperaturas diarias (None si no hay registro)
+        
+        Returns:
+            SemanaClima: Semana con un DiaClima por temperatura
+        """
+        semana = cls()
+        for numero_dia, temperatura in enumerate(temperaturas, 1):
+            semana.agregar_dia(DiaClima(numero_dia, temperatura))
+        return semana
+    
+    def cargar_temperaturas(self, valores, confiable=False):
+        """
+        Agrega un día por cada valor de un lote, continuando la numeración.
+        
+        Args:
+            valores (iterable): Temperaturas crudas (str, bytes o números)
+            confiable (bool): Si es True los valores ya son floats validados
+                (p. ej. un array de desde_binario) y no se convierten
+        
+        Returns:
+            list: Índices de los valores no válidos; esos días quedan sin
+                temperatura registrada
+        """
+        if confiable:
+            temperaturas, errores = valores, []
+        else:
+            temperaturas, errores = DiaClima.convertir_lote(valores)
+        no_validos = set(errores)
+        inicio = len(self._dias) + 1
+        for indice, temperatura in enumerate(temperaturas):
+            dia = DiaClima(inicio + indice)
+            if indice not in no_validos:
+                dia._temperatura = temperatura
+            self._dias.append(dia)
+        return errores
     
     def agregar_dia(self, dia_clima):
         """
@@ -161,18 +279,25 @@ class SemanaClima:
         Raises:
             ValueError: Si no hay días con temperatura registrada
         """
-        if not self._dias:
-            return 0.0
+        # El núcleo compartido filtra los días sin temperatura registrada
+        return calcular_promedio([dia._temperatura for dia in self._dias])
+    
+    def bosquejo_cuantiles(self, k=200):
+        """
+        Crea un bosquejo de cuantiles con las temperaturas registradas.
         
-        # Filtra días sin temperatura registrada
-        dias_con_temp = [dia for dia in self._dias if dia.temperatura is not None]
+        El bosquejo se puede combinar con los de otras semanas, meses o
+        estaciones para estimar medianas y percentiles de periodos largos.
         
-        if not dias_con_temp:
-            raise ValueError("No hay temperaturas registradas para calcular el promedio")
+        Args:
+            k (int): Parámetro de precisión del bosquejo
         
-        suma = sum(dia.temperatura for dia in dias_con_temp)
-        promedio = suma / len(dias_con_temp)
-        return round(promedio, 2)
+        Returns:
+            BosquejoCuantiles: Bosquejo de la semana
+        """
+        bosquejo = BosquejoCuantiles(k)
+        bosquejo.extender(dia._temperatura for dia in self._dias)
+        return bosquejo
     
     def clasificar_clima(self, promedio):
         """
@@ -184,44 +309,126 @@ class SemanaClima:
         Returns:
             str: Clasificación del clima
         """
-        if promedio < 10:
-            return "Muy frío"
-        elif promedio < 20:
-            return "Frío"
-        elif promedio < 25:
-            return "Templado"
-        elif promedio < 30:
-            return "Cálido"
-        else:
-            return "Muy cálido"
+        return self.clasificador.clasificar(promedio)
     
-    def mostrar_resumen(self):
+    def resumen_texto(self):
         """
-        Muestra un resumen completo de la semana climática.
+        Construye el texto completo del resumen de la semana climática.
+        
+        Returns:
+            str: Resumen con un salto de línea final, listo para una sola escritura
         """
         if not self._dias:
-            print("No hay datos climáticos registrados.")
-            return
+            return "No hay datos climáticos registrados.\n"
         
-        print("\n" + "="*50)
-        print("RESUMEN SEMANAL DEL CLIMA (POO)")
-        print("="*50)
+        lineas = ["", "="*50, "RESUMEN SEMANAL DEL CLIMA (POO)", "="*50]
         
-        # Mostrar información de cada día
-        for dia in self._dias:
-            print(f"  {dia.mostrar_info()}")
+        # Información de cada día
+        lineas.extend(f"  {dia.mostrar_info()}" for dia in self._dias)
         
-        # Calcular y mostrar promedio
+        # Calcular promedio y clasificación
         try:
             promedio = self.calcular_promedio()
             clasificacion = self.clasificar_clima(promedio)
             
-            print("\n" + "-"*30)
-            print(f"PROMEDIO SEMANAL: {promedio}°C")
-            print(f"CLASIFICACIÓN: {clasificacion}")
-            print("-"*30)
+            lineas.extend(["", "-"*30,
+                           f"PROMEDIO SEMANAL: {promedio}°C",
+                           f"CLASIFICACIÓN: {clasificacion}",
+                           "-"*30])
         except ValueError as e:
-            print(f"\nAdvertencia: {e}")
+            lineas.extend(["", f"Advertencia: {e}"])
+        return "\n".join(lineas) + "\n"
+    
+    def mostrar_resumen(self):
+        """
+        Muestra un resumen completo de la semana climática con una sola escritura.
+        """
+        print(self.resumen_texto(), end="")
+
+# Caché de resúmenes calculados, compartida por GestorClima y el modo servicio
+class CacheResumenes:
+    """
+    Caché LRU acotada de resúmenes de SemanaClima.
+    
+    Cada entrada se identifica por el número de serie de la semana, su
+    versión y la función que calculó el resumen, así que un día agregado o
+    modificado invalida automáticamente los resúmenes anteriores de esa
+    semana.
+    
+    Atributos:
+        capacidad (int): Número máximo de resúmenes guardados
+        aciertos (int): Consultas resueltas desde la caché
+        fallos (int): Consultas que tuvieron que calcular el resumen
+    """
+    
+    def __init__(self, capacidad=128):
+        """
+        Constructor de la caché.
+        
+        Args:
+            capacidad (int): Número máximo de resúmenes guardados
+        
+        Raises:
+            ValueError: Si la capacidad no es positiva
+        """
+        if capacidad < 1:
+            raise ValueError("La capacidad de la caché debe ser al menos 1")
+        self.capacidad = capacidad
+        self.aciertos = 0
+        self.fallos = 0
+        self._entradas = OrderedDict()
+    
+    def obtener(self, semana, calcular):
+        """
+        Devuelve el resumen de una semana, calculándolo solo si no está en caché.
+        
+        Args:
+            semana (SemanaClima): Semana a resumir
+            calcular (callable): Función que recibe la semana y devuelve el resumen
+        
+        Returns:
+            object: Resumen calculado por `calcular`
+        """
+        clave = (semana._serial, semana.version, calcular)
+        entradas = self._entradas
+        if clave in entradas:
+            self.aciertos += 1
+            entradas.move_to_end(clave)
+            return entradas[clave]
+        self.fallos += 1
+        resumen = entradas[clave] = calcular(semana)
+        if len(entradas) > self.capacidad:
+            entradas.popitem(last=False)
+        return resumen
+    
+    def limpiar(self):
+        """Elimina todas las entradas (las métricas se conservan)."""
+        self._entradas.clear()
+    
+    def __len__(self):
+        """Número de resúmenes guardados."""
+        return len(self._entradas)
+    
+    @property
+    def tasa_aciertos(self):
+        """Fracción de consultas resueltas desde la caché (0.0 si no hubo consultas)."""
+        total = self.aciertos + self.fallos
+        return self.aciertos / total if total else 0.0
+    
+    def metricas(self):
+        """
+        Devuelve las métricas de uso de la caché.
+        
+        Returns:
+            dict: Aciertos, fallos, tasa de aciertos y tamaño actual
+        """
+        return {
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': round(self.tasa_aciertos, 4),
+            'entradas': len(self._entradas),
+            'capacidad': self.capacidad
+        }
 
 # Clase principal que maneja la interfaz del usuario
 class GestorClima:
@@ -235,6 +442,7 @@ class GestorClima:
     def __init__(self):
         """Constructor del GestorClima."""
         self.semana_actual = None
+        self.cache = CacheResumenes()
     
     def ejecutar(self):
         """
@@ -275,7 +483,7 @@ class GestorClima:
     def mostrar_resumen_actual(self):
         """Muestra el resumen de la semana actual."""
         if self.semana_actual:
-            self.semana_actual.mostrar_resumen()
+            print(self.cache.obtener(self.semana_actual, SemanaClima.resumen_texto), end="")
         else:
             print("\nNo hay datos de semana actual. Ingrese una nueva semana primero.")
 
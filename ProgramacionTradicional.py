@@ -2,6 +2,9 @@
 Programa para calcular el promedio semanal del clima usando Programación Tradicional
 """
 
+from clima_calendario import NOMBRES_DIAS
+from clima_nucleo import calcular_promedio, clasificar_clima
+
 # CONSTANTES
 DIAS_SEMANA = 7  # Número de días en una semana
 
@@ -50,12 +53,8 @@ def calcular_promedio_semanal(temperaturas):
     Returns:
         float: Promedio semanal de temperaturas
     """
-    if not temperaturas:  # Verifica si la lista está vacía
-        return 0.0
-    
-    suma = sum(temperaturas)
-    promedio = suma / len(temperaturas)
-    return round(promedio, 2)  # Redondea a 2 decimales
+    # Devuelve 0.0 si la lista está vacía y redondea a 2 decimales
+    return calcular_promedio(temperaturas)
 
 def mostrar_resultados(temperaturas, promedio):
     """
@@ -65,59 +64,58 @@ def mostrar_resultados(temperaturas, promedio):
         temperaturas (list): Lista de temperaturas
         promedio (float): Promedio semanal
     """
-    print("\n" + "="*50)
-    print("RESULTADOS DEL PROMEDIO SEMANAL")
-    print("="*50)
+    lineas = ["", "="*50, "RESULTADOS DEL PROMEDIO SEMANAL", "="*50]
     
-    # Mostrar temperaturas diarias
-    dias = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
-    for i, (dia, temp) in enumerate(zip(dias, temperaturas), 1):
-        print(f"Día {i} ({dia}): {temp}°C")
+    # Temperaturas diarias
+    for i, (dia, temp) in enumerate(zip(NOMBRES_DIAS, temperaturas), 1):
+        lineas.append(f"Día {i} ({dia}): {temp}°C")
     
-    # Mostrar promedio
-    print("\n" + "-"*30)
-    print(f"PROMEDIO SEMANAL: {promedio}°C")
-    print("-"*30)
+    # Promedio
+    lineas.extend(["", "-"*30, f"PROMEDIO SEMANAL: {promedio}°C", "-"*30])
     
     # Clasificación del clima según el promedio
-    if promedio < 10:
-        clasificacion = "Muy frío"
-    elif promedio < 20:
-        clasificacion = "Frío"
-    elif promedio < 25:
-        clasificacion = "Templado"
-    elif promedio < 30:
-        clasificacion = "Cálido"
-    else:
-        clasificacion = "Muy cálido"
+    clasificacion = clasificar_clima(promedio)
+    lineas.append(f"Clasificación: {clasificacion}")
     
-    print(f"Clasificación: {clasificacion}")
+    # Una sola escritura para todo el bloque
+    print("\n".join(lineas))
 
 def main():
     """
     Función principal que coordina la ejecución del programa.
     """
-    print("PROGRAMA PARA CALCULAR EL PROMEDIO SEMANAL DEL CLIMA")
-    print("(Programación Tradicional)")
-    
-    # Paso 1: Ingresar temperaturas
-    temperaturas = ingresar_temperaturas_semanales()
-    
-    # Paso 2: Calcular promedio
-    promedio = calcular_promedio_semanal(temperaturas)
-    
-    # Paso 3: Mostrar resultados
-    mostrar_resultados(temperaturas, promedio)
+    # Se repite con un bucle (no recursión) para no acumular llamadas en la pila
+    while True:
+        print("PROGRAMA PARA CALCULAR EL PROMEDIO SEMANAL DEL CLIMA")
+        print("(Programación Tradicional)")
+        
+        # Paso 1: Ingresar temperaturas
+        temperaturas = ingresar_temperaturas_semanales()
+        
+        # Paso 2: Calcular promedio
+        promedio = calcular_promedio_semanal(temperaturas)
+        
+        # Paso 3: Mostrar resultados
+        mostrar_resultados(temperaturas, promedio)
+        
+        # Opcional: Permitir al usuario repetir el proceso
+        if not desea_repetir():
+            print("\n¡Gracias por usar el programa!")
+            break
+
+def desea_repetir():
+    """
+    Pregunta al usuario si quiere calcular otro promedio.
     
-    # Opcional: Permitir al usuario repetir el proceso
+    Returns:
+        bool: True si respondió 's', False si respondió 'n'
+    """
     while True:
         respuesta = input("\n¿Desea calcular otro promedio? (s/n): ").lower()
         if respuesta == 's':
-            main()  # Reiniciar el programa
-            break
+            return True
         elif respuesta == 'n':
-            print("\n¡Gracias por usar el programa!")
-            break
+            return False
         else:
             print("Por favor ingrese 's' o 'n'.")
 
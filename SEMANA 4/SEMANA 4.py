@@ -1,182 +1,244 @@
+import argparse
+import csv
+import os
 import pygame
-import random
+import struct
 import sys
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager, nullcontext
 from pygame.locals import *
 
+from tetris_engine import (
+    ACTION_DOWN, ACTION_DROP, ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE, ACTION_TICK,
+    BLACK, GRID_HEIGHT, GRID_WIDTH, RED, YELLOW, TetrisEngine,
+)
+from tetris_replay import ReplayLog, parse_seed
+
 # Constantes del juego
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 GRID_SIZE = 30
-GRID_WIDTH = 10
-GRID_HEIGHT = 20
 SIDEBAR_WIDTH = 200
 
-# Colores (RGB)
-BLACK = (0, 0, 0)
+# Colores (RGB) propios de la interfaz
 WHITE = (255, 255, 255)
 GRAY = (128, 128, 128)
-RED = (255, 0, 0)
-GREEN = (0, 255, 0)
-BLUE = (0, 120, 255)
-CYAN = (0, 255, 255)
-MAGENTA = (255, 0, 255)
-YELLOW = (255, 255, 0)
-ORANGE = (255, 165, 0)
-
-# Formas de los tetrominós con sus respectivos colores
-SHAPES = [
-    [[1, 1, 1, 1]],  # I
-    [[1, 1], [1, 1]],  # O
-    [[1, 1, 1], [0, 1, 0]],  # T
-    [[1, 1, 1], [1, 0, 0]],  # L
-    [[1, 1, 1], [0, 0, 1]],  # J
-    [[0, 1, 1], [1, 1, 0]],  # S
-    [[1, 1, 0], [0, 1, 1]]   # Z
-]
-
-# Colores correspondientes a cada forma
-SHAPE_COLORS = [CYAN, YELLOW, MAGENTA, ORANGE, BLUE, GREEN, RED]
-
-class Tetromino:
+
+
+def numbered_path(path, number):
     """
-    Clase que representa un tetrominó (pieza del Tetris).
-    Contiene la forma, color, posición y métodos para manipular la pieza.
+    Ruta de grabación de la partida número number de la sesión.
+
+    La primera partida usa la ruta tal cual y las siguientes le agregan un
+    sufijo antes de la extensión (partida.trpl, partida-2.trpl, ...) para no
+    sobrescribir las anteriores al reiniciar.
     """
-    
-    def __init__(self, x, y):
-        """Inicializa un tetrominó con forma y color aleatorios."""
-        self.x = x
-        self.y = y
-        self.shape_idx = random.randint(0, len(SHAPES) - 1)
-        self.shape = SHAPES[self.shape_idx]
-        self.color = SHAPE_COLORS[self.shape_idx]
-        self.rotation = 0
-        
-    def rotate(self):
-        """Rota el tetrominó 90 grados en sentido horario."""
-        # Transpone la matriz (cambia filas por columnas)
-        rotated = list(zip(*self.shape[::-1]))
-        # Convierte tuplas a listas
-        self.shape = [list(row) for row in rotated]
-        
-    def get_positions(self):
-        """Devuelve las posiciones de cada bloque del tetrominó en la cuadrícula."""
-        positions = []
-        for y, row in enumerate(self.shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    positions.append((self.x + x, self.y + y))
-        return positions
-    
-    def draw(self, screen, grid_x, grid_y):
-        """Dibuja el tetrominó en la pantalla."""
-        for y, row in enumerate(self.shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    rect_x = grid_x + (self.x + x) * GRID_SIZE
-                    rect_y = grid_y + (self.y + y) * GRID_SIZE
-                    pygame.draw.rect(screen, self.color, 
-                                    (rect_x, rect_y, GRID_SIZE, GRID_SIZE))
-                    pygame.draw.rect(screen, WHITE, 
-                                    (rect_x, rect_y, GRID_SIZE, GRID_SIZE), 1)
-                    
-    def get_bounding_box(self):
-        """Devuelve el cuadro delimitador del tetrominó."""
+    if number <= 1:
+        return path
+    root, extension = os.path.splitext(path)
+    return f"{root}-{number}{extension}"
+
+
+class TextCache:
+    """
+    Caché LRU de superficies de texto ya renderizadas.
+
+    Cada entrada se identifica por (fuente, texto, color), así que un texto
+    que no cambia se renderiza una sola vez con font.render.
+
+    Atributos:
+        capacity (int): Número máximo de superficies guardadas
+        hits (int): Renders evitados gracias a la caché
+        misses (int): Renders hechos con font.render
+    """
+
+    def __init__(self, capacity=64):
+        """
+        Constructor de la caché.
+
+        Args:
+            capacity (int): Número máximo de superficies guardadas
+
+        Raises:
+            ValueError: Si la capacidad no es positiva
+        """
+        if capacity < 1:
+            raise ValueError("La capacidad de la caché debe ser al menos 1")
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.started = time.perf_counter()
+        self._entries = OrderedDict()
+
+    def render(self, font, text, color):
+        """
+        Devuelve la superficie de un texto, renderizándola solo si no está en caché.
+
+        Args:
+            font (pygame.font.Font): Fuente
+            text (str): Texto
+            color (tuple): Color RGB
+
+        Returns:
+            pygame.Surface: Texto renderizado con antialiasing
+        """
+        key = (font, text, color)
+        entries = self._entries
+        if key in entries:
+            self.hits += 1
+            entries.move_to_end(key)
+            return entries[key]
+        self.misses += 1
+        surface = entries[key] = font.render(text, True, color)
+        if len(entries) > self.capacity:
+            entries.popitem(last=False)
+        return surface
+
+    def __len__(self):
+        """Número de superficies guardadas."""
+        return len(self._entries)
+
+    @property
+    def saved_per_second(self):
+        """Renders evitados por segundo desde que se creó la caché."""
+        elapsed = time.perf_counter() - self.started
+        return self.hits / elapsed if elapsed > 0 else 0.0
+
+    def metrics(self):
+        """
+        Devuelve las métricas de uso de la caché.
+
+        Returns:
+            dict: Renders evitados, renders hechos, evitados por segundo y tamaño actual
+        """
         return {
-            'left': self.x,
-            'right': self.x + len(self.shape[0]),
-            'top': self.y,
-            'bottom': self.y + len(self.shape)
+            'hits': self.hits,
+            'misses': self.misses,
+            'saved_per_second': round(self.saved_per_second, 1),
+            'size': len(self._entries)
         }
 
 
-class Grid:
+class FrameProfiler:
     """
-    Clase que representa la cuadrícula del juego.
-    Maneja la colocación de piezas, la detección de colisiones y la eliminación de líneas.
+    Mide cuánto tarda cada fase de cada cuadro del bucle principal.
+
+    Fases: events (eventos, sin contar la lógica), logic (pasos del motor),
+    grid, piece, sidebar (dibujo) y flip (envío a la pantalla).
+
+    Atributos:
+        budget_ms (float): Duración de un cuadro a los FPS deseados
+        frames (int): Cuadros medidos
+        dropped (int): Cuadros que tardaron más de 1.5 veces el presupuesto
     """
-    
-    def __init__(self, width, height):
-        """Inicializa una cuadrícula vacía."""
-        self.width = width
-        self.height = height
-        self.grid = [[0 for _ in range(width)] for _ in range(height)]
-        self.colors = [[BLACK for _ in range(width)] for _ in range(height)]
-        
-    def is_collision(self, tetromino):
-        """Verifica si el tetrominó colisiona con los bloques existentes o los bordes."""
-        for x, y in tetromino.get_positions():
-            # Verificar límites de la cuadrícula
-            if x < 0 or x >= self.width or y >= self.height:
-                return True
-            # Verificar si hay un bloque en esa posición
-            if y >= 0 and self.grid[y][x]:
-                return True
-        return False
-    
-    def add_tetromino(self, tetromino):
-        """Agrega un tetrominó a la cuadrícula."""
-        for x, y in tetromino.get_positions():
-            if y >= 0:  # Solo agregar si está dentro de la cuadrícula
-                self.grid[y][x] = 1
-                self.colors[y][x] = tetromino.color
-                
-    def clear_lines(self):
-        """Elimina las líneas completas y devuelve el número de líneas eliminadas."""
-        lines_cleared = 0
-        # Comenzar desde la parte inferior
-        y = self.height - 1
-        while y >= 0:
-            if all(self.grid[y]):
-                # Mover todas las filas superiores hacia abajo
-                for y2 in range(y, 0, -1):
-                    self.grid[y2] = self.grid[y2 - 1][:]
-                    self.colors[y2] = self.colors[y2 - 1][:]
-                # Crear una nueva fila vacía en la parte superior
-                self.grid[0] = [0 for _ in range(self.width)]
-                self.colors[0] = [BLACK for _ in range(self.width)]
-                lines_cleared += 1
-                # No decrementar y porque necesitamos revisar la nueva fila en esta posición
-            else:
-                y -= 1
-        return lines_cleared
-    
-    def draw(self, screen, grid_x, grid_y):
-        """Dibuja la cuadrícula en la pantalla."""
-        # Dibujar el fondo de la cuadrícula
-        pygame.draw.rect(screen, BLACK, 
-                        (grid_x, grid_y, self.width * GRID_SIZE, self.height * GRID_SIZE))
-        
-        # Dibujar las líneas de la cuadrícula
-        for x in range(self.width + 1):
-            pygame.draw.line(screen, GRAY, 
-                            (grid_x + x * GRID_SIZE, grid_y),
-                            (grid_x + x * GRID_SIZE, grid_y + self.height * GRID_SIZE))
-        for y in range(self.height + 1):
-            pygame.draw.line(screen, GRAY,
-                            (grid_x, grid_y + y * GRID_SIZE),
-                            (grid_x + self.width * GRID_SIZE, grid_y + y * GRID_SIZE))
-        
-        # Dibujar los bloques colocados
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.grid[y][x]:
-                    rect_x = grid_x + x * GRID_SIZE
-                    rect_y = grid_y + y * GRID_SIZE
-                    pygame.draw.rect(screen, self.colors[y][x],
-                                    (rect_x, rect_y, GRID_SIZE, GRID_SIZE))
-                    pygame.draw.rect(screen, WHITE,
-                                    (rect_x, rect_y, GRID_SIZE, GRID_SIZE), 1)
+
+    PHASES = ("events", "logic", "grid", "piece", "sidebar", "flip")
+
+    def __init__(self, fps=60, window=600, max_trace=216000):
+        """
+        Constructor del medidor.
+
+        Args:
+            fps (int): Cuadros por segundo deseados
+            window (int): Cuadros recientes usados para los percentiles
+            max_trace (int): Cuadros guardados para el archivo de traza
+                (por defecto, una hora a 60 FPS)
+        """
+        self.budget_ms = 1000 / fps
+        self.frames = 0
+        self.dropped = 0
+        self._window = deque(maxlen=window)
+        self._trace = deque(maxlen=max_trace)
+        self._current = dict.fromkeys(self.PHASES, 0)
+        self._frame_start = None
+
+    @contextmanager
+    def phase(self, name):
+        """Suma al cuadro actual el tiempo del bloque `with` en la fase indicada."""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self._current[name] += time.perf_counter_ns() - start
+
+    def begin_frame(self):
+        """Cierra el cuadro anterior (si lo hay) y empieza uno nuevo."""
+        now = time.perf_counter_ns()
+        if self._frame_start is not None:
+            self._end_frame(now)
+        self._frame_start = now
+
+    def _end_frame(self, now):
+        """Registra el cuadro que empezó en _frame_start y termina en `now`."""
+        current = self._current
+        # La lógica se ejecuta dentro del manejo de eventos
+        current["events"] -= current["logic"]
+        interval_ms = (now - self._frame_start) / 1e6
+        work_ms = sum(current.values()) / 1e6
+        self.frames += 1
+        if interval_ms > self.budget_ms * 1.5:
+            self.dropped += 1
+        self._window.append(work_ms)
+        self._trace.append((self.frames, interval_ms, work_ms) + tuple(current[p] / 1e6 for p in self.PHASES))
+        self._current = dict.fromkeys(self.PHASES, 0)
+
+    def percentile(self, p):
+        """Percentil p (0-100) del trabajo por cuadro en ms, en la ventana reciente."""
+        if not self._window:
+            return 0.0
+        ordered = sorted(self._window)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+    def summary(self):
+        """
+        Devuelve el resumen de los cuadros medidos.
+
+        Returns:
+            dict: Cuadros, cuadros perdidos y p50/p99 del trabajo por cuadro en ms
+        """
+        return {
+            'frames': self.frames,
+            'dropped': self.dropped,
+            'p50_ms': round(self.percentile(50), 3),
+            'p99_ms': round(self.percentile(99), 3)
+        }
+
+    def dump(self, path):
+        """
+        Guarda la traza de los cuadros en CSV para analizarla fuera del juego.
+
+        Columnas: frame, interval_ms (entre inicios de cuadro, incluida la
+        espera de clock.tick), work_ms y los ms de cada fase.
+        """
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(("frame", "interval_ms", "work_ms") + tuple(f"{p}_ms" for p in self.PHASES))
+            for row in self._trace:
+                writer.writerow([row[0]] + [f"{value:.4f}" for value in row[1:]])
 
 
 class Game:
     """
     Clase principal del juego Tetris.
-    Coordina todos los componentes y maneja la lógica del juego.
+    Coordina la ventana, el teclado y los temporizadores; la lógica del juego
+    vive en TetrisEngine (tetris_engine.py) y esta clase solo la dibuja.
     """
     
-    def __init__(self):
-        """Inicializa el juego con todos sus componentes."""
+    def __init__(self, seed=None, randomizer="uniform", record_path=None, profile=False, trace_path=None):
+        """
+        Inicializa el juego con todos sus componentes.
+
+        Args:
+            seed (int, optional): Semilla de las piezas (al azar si se omite)
+            randomizer (str): Generador de piezas ("uniform" o "bag")
+            record_path (str, optional): Archivo donde grabar la partida para
+                reproducirla con tetris_replay.py
+            profile (bool): Medir los tiempos de cada cuadro y mostrarlos en pantalla
+            trace_path (str, optional): Archivo CSV donde guardar la traza de
+                tiempos al salir (activa la medición)
+        """
+        self.options = (seed, randomizer, record_path, profile, trace_path)
         pygame.init()
         
         # Configurar la pantalla
@@ -195,18 +257,17 @@ class Game:
         self.grid_x = (SCREEN_WIDTH - SIDEBAR_WIDTH - GRID_WIDTH * GRID_SIZE) // 2
         self.grid_y = (SCREEN_HEIGHT - GRID_HEIGHT * GRID_SIZE) // 2
         
-        # Inicializar componentes del juego
-        self.grid = Grid(GRID_WIDTH, GRID_HEIGHT)
-        self.current_piece = self.new_piece()
-        self.next_piece = self.new_piece()
-        
-        # Variables del juego
-        self.score = 0
-        self.level = 1
-        self.lines_cleared = 0
-        self.game_over = False
+        # Lógica del juego (cuadrícula, piezas, puntuación y niveles) sin pygame
+        self.engine = TetrisEngine(GRID_WIDTH, GRID_HEIGHT, seed, randomizer)
         self.paused = False
         
+        # Grabación de las acciones con el cuadro en que ocurrieron
+        self.frame = 0
+        self.game_number = 1
+        self.record_path = record_path
+        self.replay = ReplayLog.for_engine(self.engine, self.fps)
+        self.replay_saved = False
+        
         # Control de velocidad (caída automática)
         self.fall_speed = 0.5  # segundos por cuadro
         self.fall_time = 0
@@ -215,122 +276,114 @@ class Game:
         self.FALL_EVENT = pygame.USEREVENT + 1
         pygame.time.set_timer(self.FALL_EVENT, int(self.fall_speed * 1000))
         
-    def new_piece(self):
-        """Crea una nueva pieza en la posición inicial."""
-        # La pieza aparece en la parte superior central
-        start_x = GRID_WIDTH // 2 - 1
-        start_y = 0
-        return Tetromino(start_x, start_y)
-    
-    def move_piece(self, dx, dy):
-        """Intenta mover la pieza actual y devuelve si fue exitoso."""
-        self.current_piece.x += dx
-        self.current_piece.y += dy
-        
-        if self.grid.is_collision(self.current_piece):
-            # Deshacer el movimiento si hay colisión
-            self.current_piece.x -= dx
-            self.current_piece.y -= dy
-            return False
-        return True
-    
-    def rotate_piece(self):
-        """Intenta rotar la pieza actual."""
-        # Guardar la rotación actual
-        original_shape = self.current_piece.shape
-        
-        # Rotar la pieza
-        self.current_piece.rotate()
+        # Textos ya renderizados con cada fuente
+        self.text_cache = TextCache()
         
-        # Si hay colisión después de rotar, revertir la rotación
-        if self.grid.is_collision(self.current_piece):
-            self.current_piece.shape = original_shape
-    
-    def drop_piece(self):
-        """Hace caer la pieza actual hasta que toque el fondo o otra pieza."""
-        while self.move_piece(0, 1):
-            pass  # Continuar moviendo hacia abajo hasta que haya colisión
-        
-        # Cuando no se puede mover más hacia abajo, colocar la pieza
-        self.place_piece()
-    
-    def place_piece(self):
-        """Coloca la pieza actual en la cuadrícula y genera una nueva."""
-        # Agregar la pieza actual a la cuadrícula
-        self.grid.add_tetromino(self.current_piece)
-        
-        # Verificar y eliminar líneas completas
-        lines = self.grid.clear_lines()
-        if lines > 0:
-            self.update_score(lines)
+        # Medición de tiempos por cuadro (opcional)
+        self.trace_path = trace_path
+        self.profiler = FrameProfiler(self.fps) if profile or trace_path else None
+        self.hud_rect = pygame.Rect(8, 8, self.grid_x - 16, 110)
+        self.hud_updated = 0
         
-        # Crear nueva pieza
-        self.current_piece = self.next_piece
-        self.next_piece = self.new_piece()
-        
-        # Verificar si el juego ha terminado (colisión al crear nueva pieza)
-        if self.grid.is_collision(self.current_piece):
-            self.game_over = True
+        # Superficies guardadas para redibujar solo lo que cambia
+        self.build_background()
+
+    # Vistas del estado del motor usadas al dibujar
+    @property
+    def grid(self):
+        """Cuadrícula del motor."""
+        return self.engine.grid
+
+    @property
+    def current_piece(self):
+        """Pieza que cae."""
+        return self.engine.current_piece
+
+    @property
+    def next_piece(self):
+        """Pieza que aparecerá después."""
+        return self.engine.next_piece
+
+    @property
+    def score(self):
+        """Puntuación."""
+        return self.engine.score
+
+    @property
+    def level(self):
+        """Nivel."""
+        return self.engine.level
+
+    @property
+    def lines_cleared(self):
+        """Líneas eliminadas en total."""
+        return self.engine.lines_cleared
+
+    @property
+    def game_over(self):
+        """Si la partida terminó."""
+        return self.engine.game_over
+        
+    def timing(self, phase):
+        """Contexto que mide una fase del cuadro si la medición está activa."""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.phase(phase)
     
-    def update_score(self, lines):
-        """Actualiza la puntuación basada en el número de líneas eliminadas."""
-        # Puntos según el número de líneas eliminadas a la vez
-        line_points = {1: 100, 2: 300, 3: 500, 4: 800}
-        
-        # Sumar puntos
-        self.score += line_points.get(lines, 0) * self.level
-        
-        # Actualizar líneas eliminadas y nivel
-        self.lines_cleared += lines
-        self.level = self.lines_cleared // 10 + 1
-        
-        # Aumentar la velocidad con cada nivel
-        new_speed = max(50, 1000 - (self.level - 1) * 100)  # En milisegundos
-        pygame.time.set_timer(self.FALL_EVENT, new_speed)
+    def apply_action(self, action):
+        """Aplica una acción al motor y ajusta la velocidad si se eliminaron líneas."""
+        self.replay.record(self.frame, action)
+        with self.timing("logic"):
+            lines = self.engine.step(action)
+        if lines:
+            # Aumentar la velocidad con cada nivel
+            pygame.time.set_timer(self.FALL_EVENT, self.engine.fall_interval)
+        if self.game_over:
+            self.save_replay()
     
-    def draw_sidebar(self):
-        """Dibuja la barra lateral con información del juego."""
+    def build_background(self):
+        """
+        Dibuja una sola vez todo lo que no cambia durante la partida.
+
+        Crea tres superficies:
+            empty_grid: la cuadrícula vacía con sus líneas
+            board: la cuadrícula con los bloques fijados (se actualiza por celdas)
+            background: la pantalla completa sin piezas ni textos variables
+        """
+        grid = self.grid
+        grid_w = grid.width * GRID_SIZE + 1
+        grid_h = grid.height * GRID_SIZE + 1
+        
+        # Cuadrícula vacía: fondo negro y líneas
+        self.empty_grid = pygame.Surface((grid_w, grid_h))
+        self.empty_grid.fill(BLACK)
+        for x in range(grid.width + 1):
+            pygame.draw.line(self.empty_grid, GRAY, (x * GRID_SIZE, 0), (x * GRID_SIZE, grid_h - 1))
+        for y in range(grid.height + 1):
+            pygame.draw.line(self.empty_grid, GRAY, (0, y * GRID_SIZE), (grid_w - 1, y * GRID_SIZE))
+        self.board = self.empty_grid.copy()
+        self.board_rect = pygame.Rect(self.grid_x, self.grid_y, grid_w, grid_h)
+        
+        # Fondo de la pantalla con la parte fija de la barra lateral
         sidebar_x = SCREEN_WIDTH - SIDEBAR_WIDTH
-        
-        # Fondo de la barra lateral
-        pygame.draw.rect(self.screen, (40, 40, 60), 
+        self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.background.fill((20, 20, 40))
+        self.background.blit(self.empty_grid, self.board_rect)
+        pygame.draw.rect(self.background, (40, 40, 60), 
                         (sidebar_x, 0, SIDEBAR_WIDTH, SCREEN_HEIGHT))
         
         # Título
-        title = self.big_font.render("TETRIS", True, YELLOW)
-        self.screen.blit(title, (sidebar_x + 20, 30))
-        
-        # Información del juego
-        score_text = self.font.render(f"Puntuación: {self.score}", True, WHITE)
-        level_text = self.font.render(f"Nivel: {self.level}", True, WHITE)
-        lines_text = self.font.render(f"Líneas: {self.lines_cleared}", True, WHITE)
-        
-        self.screen.blit(score_text, (sidebar_x + 20, 100))
-        self.screen.blit(level_text, (sidebar_x + 20, 140))
-        self.screen.blit(lines_text, (sidebar_x + 20, 180))
+        title = self.text_cache.render(self.big_font, "TETRIS", YELLOW)
+        self.background.blit(title, (sidebar_x + 20, 30))
         
         # Siguiente pieza
-        next_text = self.font.render("Siguiente:", True, WHITE)
-        self.screen.blit(next_text, (sidebar_x + 20, 250))
-        
-        # Dibujar la siguiente pieza
-        next_piece_x = sidebar_x + 60
-        next_piece_y = 300
-        
-        # Dibujar el fondo para la siguiente pieza
-        pygame.draw.rect(self.screen, BLACK, 
-                        (next_piece_x - 10, next_piece_y - 10, 100, 100))
-        
-        # Dibujar la siguiente pieza centrada
-        for y, row in enumerate(self.next_piece.shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    rect_x = next_piece_x + x * GRID_SIZE
-                    rect_y = next_piece_y + y * GRID_SIZE
-                    pygame.draw.rect(self.screen, self.next_piece.color,
-                                    (rect_x, rect_y, GRID_SIZE, GRID_SIZE))
-                    pygame.draw.rect(self.screen, WHITE,
-                                    (rect_x, rect_y, GRID_SIZE, GRID_SIZE), 1)
+        next_text = self.text_cache.render(self.font, "Siguiente:", WHITE)
+        self.background.blit(next_text, (sidebar_x + 20, 250))
+        # Cabe la pieza más grande (la I, 4 celdas) en cualquier orientación,
+        # con el margen de 10 px alrededor de la vista previa (sidebar_x + 60, 300)
+        preview_size = 4 * GRID_SIZE + 20
+        self.next_rect = pygame.Rect(sidebar_x + 50, 290, preview_size, preview_size)
+        pygame.draw.rect(self.background, BLACK, self.next_rect)
         
         # Controles
         controls_y = 450
@@ -346,53 +399,272 @@ class Game:
         ]
         
         for i, text in enumerate(controls):
-            control_text = self.font.render(text, True, WHITE)
-            self.screen.blit(control_text, (sidebar_x + 20, controls_y + i * 30))
+            control_text = self.text_cache.render(self.font, text, WHITE)
+            self.background.blit(control_text, (sidebar_x + 20, controls_y + i * 30))
+        
+        # Zona de la puntuación, el nivel y las líneas
+        self.stats_rect = pygame.Rect(sidebar_x, 100, SIDEBAR_WIDTH, 110)
+        
+        # Estado dibujado en el último cuadro (None obliga a redibujar)
+        self.drawn_rows = [None] * grid.height
+        self.drawn_colors = [None] * grid.height
+        self.drawn_piece = None
+        self.drawn_stats = None
+        self.drawn_next = None
+        self.drawn_overlay = None
+        
+    def cell_rect(self, x, y):
+        """Rectángulo en pantalla de una celda de la cuadrícula."""
+        return pygame.Rect(self.grid_x + x * GRID_SIZE, self.grid_y + y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
+    
+    def restore(self, rect):
+        """Repone una zona de la pantalla con el fondo y los bloques fijados."""
+        self.screen.blit(self.background, rect, rect)
+        clipped = rect.clip(self.board_rect)
+        if clipped.width and clipped.height:
+            self.screen.blit(self.board, clipped, clipped.move(-self.grid_x, -self.grid_y))
+    
+    def draw_grid(self):
+        """
+        Actualiza los bloques fijados que cambiaron desde el último cuadro.
+
+        Solo se redibujan las filas cuyo bitmask o cuyos colores cambiaron
+        (al colocar una pieza o eliminar líneas).
+
+        Returns:
+            list: Rectángulos de pantalla modificados
+        """
+        grid = self.grid
+        dirty = []
+        for y, row in enumerate(grid.rows):
+            colors = grid.colors[y]
+            if row == self.drawn_rows[y] and colors is self.drawn_colors[y]:
+                continue
+            self.drawn_rows[y] = row
+            self.drawn_colors[y] = colors
+            row_rect = pygame.Rect(0, y * GRID_SIZE, grid.width * GRID_SIZE + 1, GRID_SIZE + 1)
+            self.board.blit(self.empty_grid, row_rect, row_rect)
+            for x in range(grid.width):
+                if row >> x & 1:
+                    rect = (x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
+                    pygame.draw.rect(self.board, colors[x], rect)
+                    pygame.draw.rect(self.board, WHITE, rect, 1)
+            dirty.append(row_rect.move(self.grid_x, self.grid_y))
+        for rect in dirty:
+            self.restore(rect)
+        return dirty
+    
+    def draw_piece(self, piece, force=False):
+        """
+        Dibuja la pieza que cae y su sombra (dónde llegaría con la caída
+        rápida) si se movieron, reponiendo las celdas que dejaron.
+
+        Args:
+            piece (Tetromino): Pieza actual
+            force (bool): Dibujarlas aunque no se hayan movido (la zona se repuso)
+
+        Returns:
+            list: Rectángulos de pantalla modificados
+        """
+        positions = tuple(piece.get_positions())
+        ghost_dy = self.grid.drop_row(piece) - piece.y
+        state = (piece.color, positions, ghost_dy)
+        if state == self.drawn_piece and not force:
+            return []
+        dirty = []
+        if self.drawn_piece is not None:
+            _, old_positions, old_dy = self.drawn_piece
+            for x, y in old_positions:
+                for rect in (self.cell_rect(x, y), self.cell_rect(x, y + old_dy)):
+                    self.restore(rect)
+                    dirty.append(rect)
+        # Sombra: solo el contorno, debajo de la pieza
+        if ghost_dy:
+            for x, y in positions:
+                rect = self.cell_rect(x, y + ghost_dy)
+                pygame.draw.rect(self.screen, piece.color, rect, 2)
+                dirty.append(rect)
+        for x, y in positions:
+            rect = self.cell_rect(x, y)
+            pygame.draw.rect(self.screen, piece.color, rect)
+            pygame.draw.rect(self.screen, WHITE, rect, 1)
+            dirty.append(rect)
+        self.drawn_piece = state
+        return dirty
+    
+    def draw_sidebar(self):
+        """
+        Dibuja la parte variable de la barra lateral si cambió.
+
+        Returns:
+            list: Rectángulos de pantalla modificados
+        """
+        sidebar_x = SCREEN_WIDTH - SIDEBAR_WIDTH
+        dirty = []
         
+        # Información del juego
+        stats = (self.score, self.level, self.lines_cleared)
+        if stats != self.drawn_stats:
+            self.restore(self.stats_rect)
+            score_text = self.text_cache.render(self.font, f"Puntuación: {self.score}", WHITE)
+            level_text = self.text_cache.render(self.font, f"Nivel: {self.level}", WHITE)
+            lines_text = self.text_cache.render(self.font, f"Líneas: {self.lines_cleared}", WHITE)
+            
+            self.screen.blit(score_text, (sidebar_x + 20, 100))
+            self.screen.blit(level_text, (sidebar_x + 20, 140))
+            self.screen.blit(lines_text, (sidebar_x + 20, 180))
+            self.drawn_stats = stats
+            dirty.append(self.stats_rect)
+        
+        # Dibujar la siguiente pieza
+        next_state = (self.next_piece.shape_idx, self.next_piece.rotation)
+        if next_state != self.drawn_next:
+            self.restore(self.next_rect)
+            next_piece_x = sidebar_x + 60
+            next_piece_y = 300
+            for y, row in enumerate(self.next_piece.shape):
+                for x, cell in enumerate(row):
+                    if cell:
+                        rect_x = next_piece_x + x * GRID_SIZE
+                        rect_y = next_piece_y + y * GRID_SIZE
+                        pygame.draw.rect(self.screen, self.next_piece.color,
+                                        (rect_x, rect_y, GRID_SIZE, GRID_SIZE))
+                        pygame.draw.rect(self.screen, WHITE,
+                                        (rect_x, rect_y, GRID_SIZE, GRID_SIZE), 1)
+            self.drawn_next = next_state
+            dirty.append(self.next_rect)
+        return dirty
+    
+    def draw_overlay(self):
+        """Dibuja los mensajes de pausa y de fin del juego."""
         # Mensaje de pausa
         if self.paused:
-            pause_text = self.big_font.render("PAUSA", True, YELLOW)
+            pause_text = self.text_cache.render(self.big_font, "PAUSA", YELLOW)
             text_rect = pause_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
             self.screen.blit(pause_text, text_rect)
         
         # Mensaje de game over
         if self.game_over:
-            game_over_text = self.big_font.render("GAME OVER", True, RED)
+            game_over_text = self.text_cache.render(self.big_font, "GAME OVER", RED)
             text_rect = game_over_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
             self.screen.blit(game_over_text, text_rect)
             
-            restart_text = self.font.render("Presiona R para reiniciar", True, WHITE)
+            restart_text = self.text_cache.render(self.font, "Presiona R para reiniciar", WHITE)
             text_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20))
             self.screen.blit(restart_text, text_rect)
     
     def draw(self):
-        """Dibuja todos los elementos del juego en la pantalla."""
-        # Fondo
-        self.screen.fill((20, 20, 40))
-        
-        # Dibujar la cuadrícula
-        self.grid.draw(self.screen, self.grid_x, self.grid_y)
-        
-        # Dibujar la pieza actual
-        self.current_piece.draw(self.screen, self.grid_x, self.grid_y)
-        
-        # Dibujar la barra lateral
-        self.draw_sidebar()
-        
-        # Actualizar la pantalla
-        pygame.display.flip()
+        """
+        Dibuja en la pantalla solo lo que cambió desde el último cuadro.
+
+        El fondo y los bloques fijados están en superficies guardadas; cada
+        cuadro repone las celdas que dejó la pieza, dibuja las que ocupa
+        ahora y actualiza únicamente esos rectángulos. Al pausar, reanudar
+        o terminar la partida se redibuja la pantalla completa.
+        """
+        overlay = (self.paused, self.game_over)
+        if overlay != self.drawn_overlay:
+            # Redibujar todo: fondo, bloques, pieza, barra lateral y mensajes
+            self.drawn_stats = self.drawn_next = None
+            with self.timing("grid"):
+                self.draw_grid()
+                self.screen.blit(self.background, (0, 0))
+                self.screen.blit(self.board, self.board_rect)
+            with self.timing("piece"):
+                self.draw_piece(self.current_piece, force=True)
+            with self.timing("sidebar"):
+                self.draw_sidebar()
+                self.draw_overlay()
+                self.draw_hud(force=True)
+            self.drawn_overlay = overlay
+            with self.timing("flip"):
+                pygame.display.flip()
+            return
+        
+        with self.timing("grid"):
+            dirty = self.draw_grid()
+        with self.timing("piece"):
+            # Si se repusieron filas, la pieza pudo quedar tapada
+            dirty += self.draw_piece(self.current_piece, force=bool(dirty))
+        with self.timing("sidebar"):
+            dirty += self.draw_sidebar()
+            dirty += self.draw_hud()
+        if dirty:
+            with self.timing("flip"):
+                pygame.display.update(dirty)
+    
+    def draw_hud(self, force=False):
+        """
+        Dibuja los tiempos de cuadro (p50, p99 y cuadros perdidos), una vez por segundo.
+
+        Returns:
+            list: Rectángulos de pantalla modificados
+        """
+        if self.profiler is None:
+            return []
+        now = time.perf_counter()
+        if not force and now - self.hud_updated < 1:
+            return []
+        self.hud_updated = now
+        summary = self.profiler.summary()
+        self.restore(self.hud_rect)
+        lines = [
+            f"p50: {summary['p50_ms']:.2f} ms",
+            f"p99: {summary['p99_ms']:.2f} ms",
+            f"Perdidos: {summary['dropped']}",
+        ]
+        for i, text in enumerate(lines):
+            # Los valores cambian casi siempre: no se guardan en la caché de textos
+            surface = self.font.render(text, True, GRAY)
+            self.screen.blit(surface, (self.hud_rect.x, self.hud_rect.y + i * 30))
+        return [self.hud_rect]
+    
+    def save_replay(self):
+        """Guarda la grabación de la partida (una sola vez) si se pidió."""
+        if self.record_path is None or self.replay_saved:
+            return
+        self.replay.finish(self.engine)
+        try:
+            self.replay.save(self.record_path)
+            print(f"Partida grabada en {self.record_path} (semilla {self.engine.seed}, "
+                  f"{len(self.replay)} acciones)")
+        except (OSError, struct.error) as e:
+            print(f"[ERROR] No se pudo grabar la partida: {e}")
+        self.replay_saved = True
+    
+    def save_trace(self):
+        """Guarda la traza de tiempos por cuadro si se pidió."""
+        if self.profiler is None:
+            return
+        summary = self.profiler.summary()
+        print(f"Cuadros: {summary['frames']} (perdidos: {summary['dropped']}), "
+              f"p50 {summary['p50_ms']} ms, p99 {summary['p99_ms']} ms")
+        if self.trace_path:
+            try:
+                self.profiler.dump(self.trace_path)
+                print(f"Traza de tiempos guardada en {self.trace_path}")
+            except OSError as e:
+                print(f"[ERROR] No se pudo guardar la traza: {e}")
+    
+    def quit(self):
+        """Cierra el juego mostrando cuántos renders de texto se evitaron."""
+        self.save_replay()
+        self.save_trace()
+        metrics = self.text_cache.metrics()
+        print(f"Textos: {metrics['hits']} renders evitados, {metrics['misses']} hechos "
+              f"({metrics['saved_per_second']} evitados por segundo)")
+        pygame.quit()
+        sys.exit()
     
     def handle_events(self):
         """Maneja los eventos del juego (teclado, temporizadores, etc.)."""
         for event in pygame.event.get():
             if event.type == QUIT:
-                pygame.quit()
-                sys.exit()
+                self.quit()
             
             if event.type == KEYDOWN:
                 if event.key == K_ESCAPE:
-                    pygame.quit()
-                    sys.exit()
+                    self.quit()
                 
                 if not self.game_over:
                     if event.key == K_p:
@@ -400,34 +672,56 @@ class Game:
                     
                     if not self.paused:
                         if event.key == K_LEFT:
-                            self.move_piece(-1, 0)
+                            self.apply_action(ACTION_LEFT)
                         elif event.key == K_RIGHT:
-                            self.move_piece(1, 0)
+                            self.apply_action(ACTION_RIGHT)
                         elif event.key == K_DOWN:
-                            self.move_piece(0, 1)
+                            self.apply_action(ACTION_DOWN)
                         elif event.key == K_UP:
-                            self.rotate_piece()
+                            self.apply_action(ACTION_ROTATE)
                         elif event.key == K_SPACE:
-                            self.drop_piece()
+                            self.apply_action(ACTION_DROP)
                 
                 if event.key == K_r:
-                    self.__init__()  # Reiniciar el juego
+                    self.save_replay()
+                    profiler = self.profiler
+                    game_number = self.game_number + 1
+                    self.__init__(*self.options)  # Reiniciar el juego
+                    # Cada partida se graba en su propio archivo
+                    self.game_number = game_number
+                    if self.record_path is not None:
+                        self.record_path = numbered_path(self.record_path, game_number)
+                    if profiler is not None:
+                        # La traza de tiempos continúa entre partidas
+                        self.profiler = profiler
             
             # Evento de caída automática
             if event.type == self.FALL_EVENT and not self.paused and not self.game_over:
-                if not self.move_piece(0, 1):
-                    self.place_piece()
+                self.apply_action(ACTION_TICK)
     
     def run(self):
         """Bucle principal del juego."""
         while True:
-            self.handle_events()
+            if self.profiler is not None:
+                self.profiler.begin_frame()
+            with self.timing("events"):
+                self.handle_events()
             self.draw()
             self.clock.tick(self.fps)
+            self.frame += 1
 
 
 # Punto de entrada del programa
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tetris - POO")
+    parser.add_argument("--semilla", type=parse_seed, help="Semilla de las piezas (para repetir una partida)")
+    parser.add_argument("--bolsa", action="store_true", help="Generar las piezas con la bolsa de 7")
+    parser.add_argument("--grabar", metavar="RUTA", help="Grabar la partida para reproducirla con tetris_replay.py "
+                        "(al reiniciar se agrega -2, -3, ... al nombre)")
+    parser.add_argument("--perfil", action="store_true", help="Mostrar los tiempos de cuadro en pantalla")
+    parser.add_argument("--traza", metavar="RUTA", help="Guardar los tiempos de cada cuadro en un CSV al salir")
+    options = parser.parse_args()
+    
     print("Iniciando Tetris...")
     print("Controles:")
     print("  Flechas: Mover y rotar")
@@ -437,5 +731,6 @@ if __name__ == "__main__":
     print("  ESC: Salir")
     print("\n¡Disfruta del juego!")
     
-    game = Game()
-    game.run()
\ No newline at end of file
+    game = Game(options.semilla, "bag" if options.bolsa else "uniform", options.grabar,
+                options.perfil, options.traza)
+    game.run()
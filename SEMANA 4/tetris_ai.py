@@ -0,0 +1,350 @@
+"""
+Jugador automático de Tetris basado en la búsqueda de colocaciones.
+
+Para cada pieza nueva prueba todas las rotaciones distintas y todas las
+columnas, calcula dónde cae la pieza con un arreglo de alturas por columna
+(sin repetir move_piece(0, 1)) y puntúa el tablero resultante con cuatro
+características: altura total, huecos, irregularidad entre columnas y
+líneas eliminadas. Opcionalmente mira una pieza más allá usando next_piece.
+
+Uso:
+    python tetris_ai.py --partidas 5 --semilla 1
+    python tetris_ai.py --partidas 20 --sin-anticipacion
+"""
+
+import argparse
+import sys
+import time
+from collections import namedtuple
+
+from tetris_engine import (
+    ACTION_DROP, ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE, ROTATIONS, TetrisEngine, Tetromino,
+)
+
+
+# Pesos de las características (altura total, líneas, huecos, irregularidad)
+# ajustados por algoritmo genético en la literatura sobre Tetris
+DEFAULT_WEIGHTS = (-0.510066, 0.760666, -0.35663, -0.184483)
+
+# Mejor colocación encontrada: rotación, columna, fila de llegada y valor
+Placement = namedtuple("Placement", ["rotation", "column", "row", "value"])
+
+# Perfil de una rotación para la búsqueda:
+#   rotation: índice de la rotación en ROTATIONS
+#   columns: columnas relativas ocupadas
+#   bottoms: fila relativa más baja ocupada en cada una de esas columnas
+#   row_masks: (fila, máscara) como en Rotation
+#   min_x, max_x: columnas válidas para la esquina izquierda de la pieza
+Profile = namedtuple("Profile", ["rotation", "columns", "bottoms", "row_masks", "min_x", "max_x"])
+
+
+def _build_profiles(width):
+    """Perfiles de las rotaciones distintas de cada forma (la O tiene una sola)."""
+    profiles = []
+    for rotations in ROTATIONS:
+        seen = set()
+        unique = []
+        for rotation, current in enumerate(rotations):
+            if current.shape in seen:
+                continue
+            seen.add(current.shape)
+            columns = tuple(sorted({x for x, _ in current.offsets}))
+            bottoms = tuple(max(y for x, y in current.offsets if x == column) for column in columns)
+            unique.append(Profile(rotation, columns, bottoms, current.row_masks,
+                                  -current.left, width - 1 - current.right))
+        profiles.append(tuple(unique))
+    return tuple(profiles)
+
+
+def column_heights(rows, width):
+    """
+    Altura de cada columna (0 si está vacía) a partir de las filas en bitmask.
+
+    Args:
+        rows (list): Filas de la cuadrícula, de arriba abajo
+        width (int): Columnas de la cuadrícula
+
+    Returns:
+        list: Altura de cada columna contada desde el fondo
+    """
+    height = len(rows)
+    heights = [0] * width
+    seen = 0
+    for y, row in enumerate(rows):
+        new = row & ~seen
+        if new:
+            seen |= new
+            while new:
+                low = new & -new
+                heights[low.bit_length() - 1] = height - y
+                new ^= low
+    return heights
+
+
+class TetrisBot:
+    """
+    Jugador automático que elige la colocación con mejor valor heurístico.
+
+    Atributos:
+        weights (tuple): Pesos de altura total, líneas, huecos e irregularidad
+        lookahead (bool): Si considera también la siguiente pieza
+        evaluations (int): Tableros evaluados en total
+    """
+
+    def __init__(self, weights=DEFAULT_WEIGHTS, lookahead=True, width=None):
+        """
+        Constructor del jugador.
+
+        Args:
+            weights (tuple): Pesos de altura total, líneas, huecos e irregularidad
+            lookahead (bool): Si considera también la siguiente pieza
+            width (int, optional): Columnas de la cuadrícula (se detectan en el
+                primer tablero si se omite)
+        """
+        self.weights = tuple(weights)
+        self.lookahead = lookahead
+        self.evaluations = 0
+        self._profiles = {}
+        if width is not None:
+            self._profiles[width] = _build_profiles(width)
+
+    def _profiles_for(self, width):
+        """Perfiles precalculados para un ancho de cuadrícula."""
+        profiles = self._profiles.get(width)
+        if profiles is None:
+            profiles = self._profiles[width] = _build_profiles(width)
+        return profiles
+
+    def afterstates(self, rows, heights, width, shape_idx):
+        """
+        Genera los tableros resultantes de cada colocación de una pieza.
+
+        La fila de llegada sale directamente de las alturas de las columnas
+        que ocupa la pieza y de su perfil inferior.
+
+        Args:
+            rows (list): Filas de la cuadrícula en bitmask
+            heights (list): Altura de cada columna
+            width (int): Columnas de la cuadrícula
+            shape_idx (int): Índice de la forma en SHAPES
+
+        Yields:
+            tuple: (rotación, columna, fila, filas resultantes, líneas eliminadas)
+        """
+        height = len(rows)
+        full_row = (1 << width) - 1
+        for profile in self._profiles_for(width)[shape_idx]:
+            columns = profile.columns
+            bottoms = profile.bottoms
+            row_masks = profile.row_masks
+            for x in range(profile.min_x, profile.max_x + 1):
+                y = height
+                for column, bottom in zip(columns, bottoms):
+                    landing = height - heights[x + column] - 1 - bottom
+                    if landing < y:
+                        y = landing
+                if y < 0:
+                    continue  # No cabe: la pila llega arriba
+                after = rows[:]
+                lines = 0
+                for dy, mask in row_masks:
+                    row = after[y + dy] | (mask << x if x >= 0 else mask >> -x)
+                    after[y + dy] = row
+                    if row == full_row:
+                        lines += 1
+                if lines:
+                    after = [0] * lines + [row for row in after if row != full_row]
+                yield profile.rotation, x, y, after, lines
+
+    def evaluate(self, rows, width, lines):
+        """
+        Valor heurístico de un tablero.
+
+        Recorre las filas una sola vez de arriba abajo: la primera fila con un
+        bloque en cada columna da su altura, y las celdas vacías bajo bloques
+        ya vistos son huecos.
+
+        Args:
+            rows (list): Filas del tablero en bitmask
+            width (int): Columnas de la cuadrícula
+            lines (int): Líneas eliminadas para llegar a este tablero
+
+        Returns:
+            float: Valor del tablero (mayor es mejor)
+        """
+        self.evaluations += 1
+        height = len(rows)
+        heights = [0] * width
+        seen = 0
+        holes = 0
+        # Las filas vacías de arriba no aportan altura ni huecos
+        top = 0
+        while top < height and not rows[top]:
+            top += 1
+        for y in range(top, height):
+            row = rows[y]
+            new = row & ~seen
+            if new:
+                seen |= new
+                while new:
+                    low = new & -new
+                    heights[low.bit_length() - 1] = height - y
+                    new ^= low
+            holes += (seen & ~row).bit_count()
+        bumpiness = 0
+        previous = heights[0]
+        for current in heights[1:]:
+            bumpiness += previous - current if previous > current else current - previous
+            previous = current
+        w_height, w_lines, w_holes, w_bumpiness = self.weights
+        return w_height * sum(heights) + w_lines * lines + w_holes * holes + w_bumpiness * bumpiness
+
+    def best_placement(self, rows, width, shape_idx, next_idx=None, heights=None, reachable=None):
+        """
+        Busca la mejor colocación de una pieza.
+
+        Args:
+            rows (list): Filas de la cuadrícula en bitmask
+            width (int): Columnas de la cuadrícula
+            shape_idx (int): Forma de la pieza actual
+            next_idx (int, optional): Forma de la siguiente pieza (para anticipar)
+            heights (list, optional): Alturas de las columnas si ya se conocen
+            reachable (callable, optional): Función (rotación, columna, fila) que
+                indica si la pieza puede llegar a esa colocación; solo se
+                consulta para las que mejorarían la mejor encontrada
+
+        Returns:
+            Placement: Mejor colocación, o None si la pieza no cabe en ningún sitio
+        """
+        if heights is None:
+            heights = column_heights(rows, width)
+        look = self.lookahead and next_idx is not None
+        best = None
+        for rotation, x, y, after, lines in self.afterstates(rows, heights, width, shape_idx):
+            if look:
+                after_heights = column_heights(after, width)
+                value = None
+                for _, _, _, after2, lines2 in self.afterstates(after, after_heights, width, next_idx):
+                    candidate = self.evaluate(after2, width, lines + lines2)
+                    if value is None or candidate > value:
+                        value = candidate
+                if value is None:
+                    # La siguiente pieza no cabe: solo queda este tablero
+                    value = self.evaluate(after, width, lines) - 1000
+            else:
+                value = self.evaluate(after, width, lines)
+            if best is None or value > best.value:
+                if reachable is not None and not reachable(rotation, x, y):
+                    continue
+                best = Placement(rotation, x, y, value)
+        return best
+
+    def choose(self, engine):
+        """Mejor colocación alcanzable para la pieza actual de un TetrisEngine."""
+        grid = engine.grid
+        return self.best_placement(
+            grid.rows, grid.width, engine.current_piece.shape_idx, engine.next_piece.shape_idx,
+            grid.heights, lambda rotation, x, y: self.path_to(engine, rotation, x, y) is not None)
+
+    def path_to(self, engine, rotation, column, row):
+        """
+        Acciones que llevan la pieza actual a una colocación y la dejan caer.
+
+        Simula los movimientos sobre una copia de la pieza con las mismas
+        comprobaciones de colisión que el motor: primero rota y luego se
+        desplaza, y si algo la bloquea, se desplaza antes de rotar.
+
+        Args:
+            engine (TetrisEngine): Partida
+            rotation (int): Rotación de destino
+            column (int): Columna de destino
+            row (int): Fila de llegada esperada
+
+        Returns:
+            list: Constantes ACTION_* (rotar, desplazar y caída rápida), o
+                None si la colocación no se alcanza desde la posición actual
+        """
+        grid = engine.grid
+        piece = engine.current_piece
+        turns = (rotation - piece.rotation) % 4
+        shift = column - piece.x
+        step = 1 if shift > 0 else -1
+        rotations = [ACTION_ROTATE] * turns
+        moves = [ACTION_RIGHT if shift > 0 else ACTION_LEFT] * abs(shift)
+        for rotate_first in (True, False):
+            ghost = Tetromino(piece.x, piece.y, piece.shape_idx)
+            ghost.rotation = piece.rotation
+            path = rotations + moves if rotate_first else moves + rotations
+            blocked = False
+            for action in path:
+                if action == ACTION_ROTATE:
+                    ghost.rotate()
+                else:
+                    ghost.x += step
+                if grid.is_collision(ghost):
+                    blocked = True
+                    break
+            if not blocked and grid.drop_row(ghost) == row:
+                return path + [ACTION_DROP]
+        return None
+
+    def actions_for(self, engine, placement):
+        """
+        Acciones que llevan la pieza actual a una colocación y la dejan caer.
+
+        Args:
+            engine (TetrisEngine): Partida
+            placement (Placement): Colocación elegida con choose
+
+        Returns:
+            list: Constantes ACTION_* (rotar, desplazar y caída rápida), o
+                None si la colocación no se alcanza
+        """
+        return self.path_to(engine, placement.rotation, placement.column, placement.row)
+
+    def play(self, engine, max_pieces=None):
+        """
+        Juega una partida completa con el motor.
+
+        Args:
+            engine (TetrisEngine): Partida a jugar
+            max_pieces (int, optional): Límite de piezas
+
+        Returns:
+            int: Puntuación final
+        """
+        while not engine.game_over and (max_pieces is None or engine.pieces_placed < max_pieces):
+            placement = self.choose(engine)
+            actions = None if placement is None else self.actions_for(engine, placement)
+            if actions is None:
+                # Ninguna colocación alcanzable: la pieza cae donde está
+                engine.step(ACTION_DROP)
+                continue
+            engine.run(actions)
+        return engine.score
+
+
+def main(arguments=None):
+    """Juega partidas automáticas y muestra resultados y evaluaciones por segundo."""
+    parser = argparse.ArgumentParser(description="Jugador automático de Tetris")
+    parser.add_argument("--partidas", type=int, default=5, help="Partidas a jugar (por defecto 5)")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla de la primera partida")
+    parser.add_argument("--max-piezas", type=int, default=500, help="Piezas por partida como máximo (por defecto 500)")
+    parser.add_argument("--sin-anticipacion", action="store_true", help="No considerar la siguiente pieza")
+    options = parser.parse_args(arguments)
+
+    bot = TetrisBot(lookahead=not options.sin_anticipacion)
+    start = time.perf_counter()
+    for game in range(options.partidas):
+        engine = TetrisEngine(seed=options.semilla + game)
+        score = bot.play(engine, options.max_piezas)
+        print(f"Partida {game + 1}: {engine.pieces_placed} piezas, "
+              f"{engine.lines_cleared} líneas, {score} puntos")
+    elapsed = time.perf_counter() - start
+    print(f"Evaluaciones: {bot.evaluations} ({bot.evaluations / elapsed / 1000:,.1f} por milisegundo)")
+    return 0
+
+
+# Punto de entrada del programa
+if __name__ == "__main__":
+    sys.exit(main())
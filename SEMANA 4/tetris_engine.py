@@ -0,0 +1,497 @@
+"""
+Motor de Tetris sin interfaz gráfica.
+
+Contiene toda la lógica del juego (cuadrícula, piezas, puntuación y niveles)
+sin depender de pygame, de modo que una partida puede simularse en un
+servidor sin pantalla. El motor avanza de forma determinista a partir de una
+semilla y de un flujo de acciones; la ventana de SEMANA 4.py solo lo dibuja.
+
+Uso:
+    python tetris_engine.py --partidas 1000 --semilla 7
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import namedtuple
+
+
+# Tamaño de la cuadrícula
+GRID_WIDTH = 10
+GRID_HEIGHT = 20
+
+# Colores (RGB)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+BLUE = (0, 120, 255)
+CYAN = (0, 255, 255)
+MAGENTA = (255, 0, 255)
+YELLOW = (255, 255, 0)
+ORANGE = (255, 165, 0)
+
+# Formas de los tetrominós con sus respectivos colores
+SHAPES = [
+    [[1, 1, 1, 1]],  # I
+    [[1, 1], [1, 1]],  # O
+    [[1, 1, 1], [0, 1, 0]],  # T
+    [[1, 1, 1], [1, 0, 0]],  # L
+    [[1, 1, 1], [0, 0, 1]],  # J
+    [[0, 1, 1], [1, 1, 0]],  # S
+    [[1, 1, 0], [0, 1, 1]]   # Z
+]
+
+# Colores correspondientes a cada forma
+SHAPE_COLORS = [CYAN, YELLOW, MAGENTA, ORANGE, BLUE, GREEN, RED]
+
+# Puntos según el número de líneas eliminadas a la vez
+LINE_POINTS = {1: 100, 2: 300, 3: 500, 4: 800}
+
+# Acciones que acepta TetrisEngine.step
+ACTION_NONE = 0
+ACTION_LEFT = 1
+ACTION_RIGHT = 2
+ACTION_DOWN = 3    # Baja una fila sin fijar la pieza
+ACTION_ROTATE = 4
+ACTION_DROP = 5    # Caída rápida hasta el fondo
+ACTION_TICK = 6    # Caída automática: baja una fila o fija la pieza
+ACTIONS = ("none", "left", "right", "down", "rotate", "drop", "tick")
+
+# Generadores de piezas: "uniform" elige cada pieza al azar; "bag" saca las
+# 7 piezas de una bolsa barajada antes de volver a llenarla
+RANDOMIZERS = ("uniform", "bag")
+
+# Rotación precalculada de una forma:
+#   shape: matriz inmutable (tupla de tuplas)
+#   offsets: (x, y) de cada bloque relativo a la esquina de la pieza
+#   row_masks: (fila, máscara de bits) de cada fila con bloques
+#   width, height: tamaño del cuadro delimitador
+#   left, right: primera y última columna ocupada
+#   bottom_profile: (columna, fila más baja ocupada) de cada columna ocupada
+Rotation = namedtuple("Rotation", ["shape", "offsets", "row_masks", "width", "height", "left", "right",
+                                   "bottom_profile"])
+
+
+def _build_rotations(shape):
+    """Calcula las 4 rotaciones en sentido horario de una forma."""
+    rotations = []
+    for _ in range(4):
+        shape = tuple(tuple(row) for row in shape)
+        offsets = tuple((x, y) for y, row in enumerate(shape) for x, cell in enumerate(row) if cell)
+        row_masks = tuple((y, sum(1 << x for x, cell in enumerate(row) if cell))
+                          for y, row in enumerate(shape) if any(row))
+        columns = sorted({x for x, _ in offsets})
+        bottom_profile = tuple((column, max(y for x, y in offsets if x == column)) for column in columns)
+        rotations.append(Rotation(shape, offsets, row_masks, len(shape[0]), len(shape),
+                                  columns[0], columns[-1], bottom_profile))
+        # Transpone la matriz invertida (giro de 90 grados en sentido horario)
+        shape = tuple(zip(*shape[::-1]))
+    return tuple(rotations)
+
+
+# Las 4 rotaciones de cada forma, calculadas una sola vez al importar
+ROTATIONS = tuple(_build_rotations(shape) for shape in SHAPES)
+
+
+def fall_interval(level):
+    """Milisegundos entre caídas automáticas en un nivel (más rápido en cada nivel)."""
+    return max(50, 1000 - (level - 1) * 100)
+
+
+class Tetromino:
+    """
+    Clase que representa un tetrominó (pieza del Tetris).
+    Contiene la forma, color, posición y métodos para manipular la pieza.
+
+    La forma no se reconstruye al rotar: la pieza guarda el índice de su
+    rotación y consulta las tablas precalculadas de ROTATIONS.
+    """
+
+    def __init__(self, x, y, shape_idx=None):
+        """
+        Inicializa un tetrominó.
+
+        Args:
+            x (int): Columna de la esquina superior izquierda
+            y (int): Fila de la esquina superior izquierda
+            shape_idx (int, optional): Índice en SHAPES (aleatorio si se omite)
+        """
+        self.x = x
+        self.y = y
+        self.shape_idx = random.randint(0, len(SHAPES) - 1) if shape_idx is None else shape_idx
+        self.color = SHAPE_COLORS[self.shape_idx]
+        self.rotation = 0
+
+    @property
+    def current(self):
+        """Rotation precalculada de la orientación actual."""
+        return ROTATIONS[self.shape_idx][self.rotation]
+
+    @property
+    def shape(self):
+        """Matriz de la orientación actual (inmutable)."""
+        return ROTATIONS[self.shape_idx][self.rotation].shape
+
+    def rotate(self, turns=1):
+        """Rota el tetrominó 90 grados en sentido horario (o -90 con turns=-1)."""
+        self.rotation = (self.rotation + turns) % 4
+
+    def get_positions(self):
+        """Genera las posiciones de cada bloque del tetrominó en la cuadrícula."""
+        x, y = self.x, self.y
+        for dx, dy in ROTATIONS[self.shape_idx][self.rotation].offsets:
+            yield x + dx, y + dy
+
+    def get_row_masks(self):
+        """
+        Devuelve la máscara de bits de cada fila de la forma.
+
+        El bit x de cada máscara corresponde a la columna x de la forma,
+        por lo que basta desplazarla self.x posiciones para ubicarla en la
+        cuadrícula.
+
+        Returns:
+            tuple: Pares (fila de la forma, máscara) de las filas con bloques
+        """
+        return ROTATIONS[self.shape_idx][self.rotation].row_masks
+
+    def get_bounding_box(self):
+        """Devuelve el cuadro delimitador del tetrominó."""
+        current = self.current
+        return {
+            'left': self.x,
+            'right': self.x + current.width,
+            'top': self.y,
+            'bottom': self.y + current.height
+        }
+
+
+class Grid:
+    """
+    Clase que representa la cuadrícula del juego.
+    Maneja la colocación de piezas, la detección de colisiones y la eliminación de líneas.
+
+    Cada fila se guarda como un entero (bitboard): el bit x indica si la
+    columna x está ocupada. Así una fila completa se detecta con una sola
+    comparación y una colisión con unas pocas operaciones AND.
+
+    Además se mantiene la altura de cada columna (heights), con la que la
+    fila de llegada de una caída se calcula directamente.
+    """
+
+    def __init__(self, width, height):
+        """Inicializa una cuadrícula vacía."""
+        self.width = width
+        self.height = height
+        self.full_row = (1 << width) - 1
+        self.rows = [0] * height
+        self.heights = [0] * width
+        self.colors = [[BLACK for _ in range(width)] for _ in range(height)]
+
+    @property
+    def grid(self):
+        """Vista de la cuadrícula como lista de listas de 0 y 1 (solo lectura)."""
+        return [[(row >> x) & 1 for x in range(self.width)] for row in self.rows]
+
+    def is_collision(self, tetromino):
+        """Verifica si el tetrominó colisiona con los bloques existentes o los bordes."""
+        current = tetromino.current
+        x, y = tetromino.x, tetromino.y
+        # Verificar límites laterales con las columnas ocupadas precalculadas
+        if x + current.left < 0 or x + current.right >= self.width:
+            return True
+        # Verificar el fondo y los bloques de las filas que ocupa la pieza
+        rows = self.rows
+        for dy, mask in current.row_masks:
+            row = y + dy
+            if row >= self.height:
+                return True
+            if row >= 0 and rows[row] & (mask << x if x >= 0 else mask >> -x):
+                return True
+        return False
+
+    def add_tetromino(self, tetromino):
+        """Agrega un tetrominó a la cuadrícula."""
+        heights = self.heights
+        for x, y in tetromino.get_positions():
+            if y >= 0:  # Solo agregar si está dentro de la cuadrícula
+                self.rows[y] |= 1 << x
+                self.colors[y][x] = tetromino.color
+                if self.height - y > heights[x]:
+                    heights[x] = self.height - y
+
+    def clear_lines(self):
+        """Elimina las líneas completas y devuelve el número de líneas eliminadas."""
+        full_row = self.full_row
+        # Compactar en una sola pasada: conservar las filas incompletas en orden
+        kept = [y for y in range(self.height) if self.rows[y] != full_row]
+        lines_cleared = self.height - len(kept)
+        if lines_cleared:
+            # Las filas nuevas vacías entran por la parte superior
+            self.rows = [0] * lines_cleared + [self.rows[y] for y in kept]
+            self.colors = ([[BLACK] * self.width for _ in range(lines_cleared)]
+                           + [self.colors[y] for y in kept])
+            self._update_heights()
+        return lines_cleared
+
+    def _update_heights(self):
+        """Recalcula las alturas tras eliminar líneas (una pasada por las filas)."""
+        heights = self.heights = [0] * self.width
+        seen = 0
+        for y, row in enumerate(self.rows):
+            new = row & ~seen
+            if new:
+                seen |= new
+                while new:
+                    low = new & -new
+                    heights[low.bit_length() - 1] = self.height - y
+                    new ^= low
+                if seen == self.full_row:
+                    break
+
+    def drop_row(self, tetromino):
+        """
+        Fila a la que llegaría el tetrominó si cayera en línea recta.
+
+        Si la pieza está por encima de la pila en todas sus columnas, la fila
+        sale directamente de las alturas y del perfil inferior de la pieza.
+        Solo si está metida bajo un saliente se baja fila a fila.
+
+        Args:
+            tetromino (Tetromino): Pieza en una posición sin colisión
+
+        Returns:
+            int: Fila de la esquina superior de la pieza al llegar
+        """
+        x, y = tetromino.x, tetromino.y
+        heights = self.heights
+        landing = self.height
+        for column, bottom in tetromino.current.bottom_profile:
+            free = self.height - heights[x + column] - 1 - bottom
+            if free < y:
+                break  # La pieza está bajo la cima de esta columna
+            if free < landing:
+                landing = free
+        else:
+            return landing
+        original = tetromino.y
+        while not self.is_collision(tetromino):
+            tetromino.y += 1
+        landing = tetromino.y - 1
+        tetromino.y = original
+        return landing
+
+
+class TetrisEngine:
+    """
+    Partida de Tetris sin interfaz: cuadrícula, pieza actual, siguiente
+    pieza, puntuación y nivel.
+
+    Con la misma semilla, el mismo generador de piezas y el mismo flujo de
+    acciones, dos partidas terminan siempre en el mismo estado.
+
+    Atributos:
+        grid (Grid): Cuadrícula con los bloques fijados
+        current_piece (Tetromino): Pieza que cae
+        next_piece (Tetromino): Pieza que aparecerá después
+        score (int): Puntuación
+        level (int): Nivel (sube cada 10 líneas)
+        lines_cleared (int): Líneas eliminadas en total
+        pieces_placed (int): Piezas fijadas en la cuadrícula
+        game_over (bool): Si la partida terminó
+        seed (int): Semilla de la secuencia de piezas
+        randomizer (str): Generador de piezas ("uniform" o "bag")
+    """
+
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT, seed=None, randomizer="uniform"):
+        """
+        Constructor del motor.
+
+        Args:
+            width (int): Columnas de la cuadrícula
+            height (int): Filas de la cuadrícula
+            seed (int, optional): Semilla de la secuencia de piezas (se elige
+                una al azar si se omite, para poder reproducir la partida)
+            randomizer (str): "uniform" o "bag" (bolsa de 7 piezas)
+
+        Raises:
+            ValueError: Si el generador de piezas no es válido
+        """
+        if randomizer not in RANDOMIZERS:
+            raise ValueError(f"Generador de piezas no válido: {randomizer!r}")
+        self.width = width
+        self.height = height
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.randomizer = randomizer
+        self.reset()
+
+    def reset(self):
+        """Empieza una partida nueva con la misma semilla."""
+        self.random = random.Random(self.seed)
+        self._bag = []
+        self.grid = Grid(self.width, self.height)
+        self.current_piece = self.new_piece()
+        self.next_piece = self.new_piece()
+        self.score = 0
+        self.level = 1
+        self.lines_cleared = 0
+        self.pieces_placed = 0
+        self.game_over = False
+
+    @property
+    def fall_interval(self):
+        """Milisegundos entre caídas automáticas en el nivel actual."""
+        return fall_interval(self.level)
+
+    def next_shape(self):
+        """Índice de la forma de la próxima pieza según el generador."""
+        if self.randomizer == "bag":
+            if not self._bag:
+                self._bag = list(range(len(SHAPES)))
+                self.random.shuffle(self._bag)
+            return self._bag.pop()
+        return self.random.randrange(len(SHAPES))
+
+    def new_piece(self):
+        """Crea una nueva pieza en la posición inicial."""
+        # La pieza aparece en la parte superior central
+        return Tetromino(self.width // 2 - 1, 0, self.next_shape())
+
+    def move_piece(self, dx, dy):
+        """Intenta mover la pieza actual y devuelve si fue exitoso."""
+        piece = self.current_piece
+        piece.x += dx
+        piece.y += dy
+        if self.grid.is_collision(piece):
+            # Deshacer el movimiento si hay colisión
+            piece.x -= dx
+            piece.y -= dy
+            return False
+        return True
+
+    def rotate_piece(self):
+        """Intenta rotar la pieza actual y devuelve si fue exitoso."""
+        self.current_piece.rotate()
+        # Si hay colisión después de rotar, revertir la rotación
+        if self.grid.is_collision(self.current_piece):
+            self.current_piece.rotate(-1)
+            return False
+        return True
+
+    def drop_piece(self):
+        """Hace caer la pieza actual hasta el fondo, la fija y devuelve las líneas eliminadas."""
+        self.current_piece.y = self.grid.drop_row(self.current_piece)
+        return self.place_piece()
+
+    def place_piece(self):
+        """
+        Fija la pieza actual, elimina las líneas completas y saca la siguiente pieza.
+
+        Returns:
+            int: Líneas eliminadas
+        """
+        self.grid.add_tetromino(self.current_piece)
+        self.pieces_placed += 1
+        lines = self.grid.clear_lines()
+        if lines > 0:
+            self.update_score(lines)
+        self.current_piece = self.next_piece
+        self.next_piece = self.new_piece()
+        # El juego termina si la nueva pieza no cabe
+        if self.grid.is_collision(self.current_piece):
+            self.game_over = True
+        return lines
+
+    def update_score(self, lines):
+        """Actualiza la puntuación, las líneas y el nivel tras eliminar líneas."""
+        self.score += LINE_POINTS.get(lines, 0) * self.level
+        self.lines_cleared += lines
+        self.level = self.lines_cleared // 10 + 1
+
+    def step(self, action):
+        """
+        Aplica una acción a la partida.
+
+        Args:
+            action (int): Una de las constantes ACTION_*
+
+        Returns:
+            int: Líneas eliminadas por la acción (0 si la partida ya terminó)
+
+        Raises:
+            ValueError: Si la acción no es válida
+        """
+        if self.game_over:
+            return 0
+        if action == ACTION_TICK:
+            if not self.move_piece(0, 1):
+                return self.place_piece()
+        elif action == ACTION_LEFT:
+            self.move_piece(-1, 0)
+        elif action == ACTION_RIGHT:
+            self.move_piece(1, 0)
+        elif action == ACTION_DOWN:
+            self.move_piece(0, 1)
+        elif action == ACTION_ROTATE:
+            self.rotate_piece()
+        elif action == ACTION_DROP:
+            return self.drop_piece()
+        elif action != ACTION_NONE:
+            raise ValueError(f"Acción no válida: {action!r}")
+        return 0
+
+    def run(self, actions):
+        """
+        Aplica un flujo de acciones hasta agotarlo o hasta que termine la partida.
+
+        Args:
+            actions (iterable): Constantes ACTION_*
+
+        Returns:
+            int: Puntuación final
+        """
+        for action in actions:
+            if self.game_over:
+                break
+            self.step(action)
+        return self.score
+
+
+def _random_actions(rng):
+    """Flujo infinito de acciones al azar, con caídas automáticas intercaladas."""
+    choices = (ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE, ACTION_TICK, ACTION_TICK, ACTION_DROP)
+    while True:
+        yield rng.choice(choices)
+
+
+def main(arguments=None):
+    """Simula partidas con acciones al azar y muestra el rendimiento del motor."""
+    parser = argparse.ArgumentParser(description="Simulación de partidas de Tetris sin pantalla")
+    parser.add_argument("--partidas", type=int, default=1000, help="Partidas a simular (por defecto 1000)")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla de la primera partida")
+    parser.add_argument("--bolsa", action="store_true", help="Generar las piezas con la bolsa de 7")
+    options = parser.parse_args(arguments)
+
+    pieces = lines = score = 0
+    start = time.perf_counter()
+    for game in range(options.partidas):
+        seed = options.semilla + game
+        engine = TetrisEngine(seed=seed, randomizer="bag" if options.bolsa else "uniform")
+        engine.run(_random_actions(random.Random(seed)))
+        pieces += engine.pieces_placed
+        lines += engine.lines_cleared
+        score += engine.score
+    elapsed = time.perf_counter() - start
+
+    print(f"Partidas: {options.partidas}")
+    print(f"Piezas fijadas: {pieces} ({pieces / elapsed:,.0f} por segundo)")
+    print(f"Líneas eliminadas: {lines}")
+    print(f"Puntuación media: {score / max(1, options.partidas):.1f}")
+    print(f"Tiempo: {elapsed:.2f} s")
+    return 0
+
+
+# Punto de entrada del programa
+if __name__ == "__main__":
+    sys.exit(main())
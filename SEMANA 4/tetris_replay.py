@@ -0,0 +1,258 @@
+"""
+Grabación y reproducción determinista de partidas de Tetris.
+
+Una partida queda definida por la semilla, el generador de piezas y la
+secuencia de acciones, así que basta guardar eso para reproducirla. Cada
+acción se guarda junto con el cuadro en que ocurrió, codificada como un
+entero de longitud variable ((cuadros desde la acción anterior << 3) |
+acción): una partida típica ocupa un par de bytes por acción.
+
+El reproductor vuelve a jugar la partida con TetrisEngine sin pantalla, a
+miles de veces la velocidad real, y comprueba que la puntuación coincide
+con la grabada.
+
+Uso:
+    python tetris_replay.py partida.trpl
+"""
+
+import argparse
+import struct
+import sys
+import time
+from collections import namedtuple
+
+from tetris_engine import ACTIONS, GRID_HEIGHT, GRID_WIDTH, RANDOMIZERS, TetrisEngine
+
+
+# Cabecera: firma, versión, semilla, generador, ancho, alto, cuadros por
+# segundo, puntuación, líneas y piezas finales, y número de acciones
+_MAGIC = b"TRPL"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBQBBBHqqqI")
+
+# La semilla se guarda como entero sin signo de 64 bits
+MAX_SEED = 2 ** 64 - 1
+
+# Resultado de reproducir una grabación
+ReplayResult = namedtuple("ReplayResult", ["score", "lines", "pieces", "frames", "matches", "seconds"])
+
+
+class ReplayLog:
+    """
+    Registro compacto de las acciones de una partida.
+
+    Atributos:
+        seed (int): Semilla de la partida
+        randomizer (str): Generador de piezas ("uniform" o "bag")
+        width (int): Columnas de la cuadrícula
+        height (int): Filas de la cuadrícula
+        fps (int): Cuadros por segundo de la partida grabada
+        score (int): Puntuación final grabada (None si no terminó de grabarse)
+        lines (int): Líneas eliminadas grabadas
+        pieces (int): Piezas fijadas grabadas
+    """
+
+    def __init__(self, seed, randomizer="uniform", width=GRID_WIDTH, height=GRID_HEIGHT, fps=60):
+        """
+        Constructor del registro.
+
+        Raises:
+            ValueError: Si la semilla no cabe en la cabecera o el generador
+                de piezas no es válido
+        """
+        if not 0 <= seed <= MAX_SEED:
+            raise ValueError(f"La semilla debe estar entre 0 y {MAX_SEED}: {seed!r}")
+        if randomizer not in RANDOMIZERS:
+            raise ValueError(f"Generador de piezas no válido: {randomizer!r}")
+        self.seed = seed
+        self.randomizer = randomizer
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.score = None
+        self.lines = None
+        self.pieces = None
+        self._data = bytearray()
+        self._count = 0
+        self._last_frame = 0
+
+    @classmethod
+    def for_engine(cls, engine, fps=60):
+        """Crea un registro con la configuración de un TetrisEngine."""
+        return cls(engine.seed, engine.randomizer, engine.width, engine.height, fps)
+
+    def record(self, frame, action):
+        """
+        Agrega una acción.
+
+        Args:
+            frame (int): Cuadro en que ocurrió (no decreciente)
+            action (int): Constante ACTION_*
+
+        Raises:
+            ValueError: Si el cuadro retrocede o la acción no es válida
+        """
+        if frame < self._last_frame:
+            raise ValueError("Los cuadros del registro no pueden retroceder")
+        if not 0 <= action < len(ACTIONS):
+            raise ValueError(f"Acción no válida: {action!r}")
+        value = (frame - self._last_frame) << 3 | action
+        # Entero de longitud variable: 7 bits por byte, el bit alto indica continuación
+        while value >= 0x80:
+            self._data.append(value & 0x7F | 0x80)
+            value >>= 7
+        self._data.append(value)
+        self._last_frame = frame
+        self._count += 1
+
+    def finish(self, engine):
+        """Guarda la puntuación, las líneas y las piezas finales de la partida."""
+        self.score = engine.score
+        self.lines = engine.lines_cleared
+        self.pieces = engine.pieces_placed
+
+    def __len__(self):
+        """Número de acciones grabadas."""
+        return self._count
+
+    def __iter__(self):
+        """Genera los pares (cuadro, acción) en orden."""
+        frame = 0
+        value = shift = 0
+        for byte in self._data:
+            value |= (byte & 0x7F) << shift
+            if byte & 0x80:
+                shift += 7
+                continue
+            frame += value >> 3
+            yield frame, value & 7
+            value = shift = 0
+
+    def actions(self):
+        """Genera solo las acciones, en orden."""
+        for _, action in self:
+            yield action
+
+    def to_bytes(self):
+        """Serializa el registro (cabecera y acciones)."""
+        finished = self.score is not None
+        header = _HEADER.pack(_MAGIC, _VERSION, self.seed, RANDOMIZERS.index(self.randomizer),
+                              self.width, self.height, self.fps,
+                              self.score if finished else -1, self.lines if finished else -1,
+                              self.pieces if finished else -1, self._count)
+        return header + bytes(self._data)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Reconstruye un registro serializado con to_bytes.
+
+        Raises:
+            ValueError: Si los datos no son una grabación válida
+        """
+        if len(data) < _HEADER.size:
+            raise ValueError("La grabación está incompleta")
+        (magic, version, seed, randomizer, width, height, fps,
+         score, lines, pieces, count) = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("El archivo no es una grabación de Tetris compatible")
+        # La pieza I necesita al menos 4 celdas en cada dirección
+        if randomizer >= len(RANDOMIZERS) or fps == 0 or width < 4 or height < 4:
+            raise ValueError("La cabecera de la grabación está dañada")
+        log = cls(seed, RANDOMIZERS[randomizer], width, height, fps)
+        if score >= 0:
+            log.score, log.lines, log.pieces = score, lines, pieces
+        log._data = bytearray(data[_HEADER.size:])
+        if log._data and log._data[-1] & 0x80:
+            raise ValueError("La grabación está incompleta")
+        recorded = 0
+        for frame, action in log:
+            if action >= len(ACTIONS):
+                raise ValueError(f"La grabación contiene una acción no válida: {action}")
+            log._last_frame = frame
+            recorded += 1
+        if recorded != count:
+            raise ValueError("El número de acciones no coincide con la cabecera")
+        log._count = count
+        return log
+
+    def save(self, path):
+        """Guarda el registro en un archivo."""
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """Carga un registro desde un archivo."""
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+
+def parse_seed(text):
+    """
+    Convierte una semilla de la línea de comandos (tipo para argparse).
+
+    Raises:
+        argparse.ArgumentTypeError: Si no es un entero entre 0 y MAX_SEED
+    """
+    try:
+        seed = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"semilla no válida: {text!r}")
+    if not 0 <= seed <= MAX_SEED:
+        raise argparse.ArgumentTypeError(f"la semilla debe estar entre 0 y {MAX_SEED}")
+    return seed
+
+
+def replay(log):
+    """
+    Vuelve a jugar una grabación sin pantalla.
+
+    Args:
+        log (ReplayLog): Grabación
+
+    Returns:
+        ReplayResult: Resultado final, cuadros grabados, si coincide con la
+            puntuación grabada (None si no se grabó) y segundos empleados
+    """
+    start = time.perf_counter()
+    engine = TetrisEngine(log.width, log.height, log.seed, log.randomizer)
+    frames = 0
+    for frame, action in log:
+        engine.step(action)
+        frames = frame
+    elapsed = time.perf_counter() - start
+    matches = None
+    if log.score is not None:
+        matches = (engine.score, engine.lines_cleared, engine.pieces_placed) == (log.score, log.lines, log.pieces)
+    return ReplayResult(engine.score, engine.lines_cleared, engine.pieces_placed, frames, matches, elapsed)
+
+
+def main(arguments=None):
+    """Reproduce grabaciones y verifica su puntuación."""
+    parser = argparse.ArgumentParser(description="Reproductor de partidas de Tetris grabadas")
+    parser.add_argument("archivos", nargs="+", help="Grabaciones (.trpl)")
+    options = parser.parse_args(arguments)
+
+    code = 0
+    for path in options.archivos:
+        try:
+            log = ReplayLog.load(path)
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] {path}: {e}", file=sys.stderr)
+            code = 1
+            continue
+        result = replay(log)
+        real_seconds = result.frames / log.fps
+        speed = real_seconds / result.seconds if result.seconds > 0 else float("inf")
+        status = {True: "coincide", False: "NO coincide", None: "sin puntuación grabada"}[result.matches]
+        print(f"{path}: {len(log)} acciones, {result.pieces} piezas, {result.lines} líneas, "
+              f"{result.score} puntos ({status}); {speed:,.0f}x tiempo real")
+        if result.matches is False:
+            code = 1
+    return code
+
+
+# Punto de entrada del programa
+if __name__ == "__main__":
+    sys.exit(main())
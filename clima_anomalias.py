@@ -0,0 +1,227 @@
+"""
+Detección en línea de días anómalos a partir de las temperaturas diarias.
+
+Cada estación tiene un detector con memoria constante que compara cada nueva
+lectura con dos referencias:
+    * Una línea base móvil de los últimos días (puntuación z).
+    * Una climatología por día del año que se actualiza con media y varianza
+      exponenciales (desviación estacional).
+
+Las alertas se entregan como un generador o mediante una función callback.
+"""
+
+from collections import deque, namedtuple
+from math import sqrt
+
+
+# Alerta emitida por un detector
+Alerta = namedtuple("Alerta", ["estacion", "fecha", "temperatura", "tipo", "puntuacion", "referencia"])
+
+ALERTA_ZSCORE = "zscore"
+ALERTA_ESTACIONAL = "estacional"
+
+# Primer día del año (base 0) de cada mes en un año no bisiesto; el 29 de
+# febrero comparte casilla con el 28
+_INICIO_MES = (0, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+_DIAS_ANIO = 365
+
+
+def _dia_del_anio(fecha):
+    """Casilla (0-364) de la climatología correspondiente a una fecha."""
+    dia = fecha.day
+    if fecha.month == 2 and dia == 29:
+        dia = 28
+    return _INICIO_MES[fecha.month] + dia - 1
+
+
+class DetectorAnomalias:
+    """
+    Detector de anomalías de temperatura para una estación.
+
+    Atributos:
+        estacion (hashable): Identificador de la estación
+        ventana (int): Días de la línea base móvil
+        umbral_z (float): |z| a partir del cual un día es anómalo
+        umbral_estacional (float): |z| estacional a partir del cual un día es anómalo
+        minimo_dias (int): Días necesarios en la ventana antes de alertar
+        minimo_anios (int): Observaciones de un mismo día del año antes de alertar
+        alfa (float): Peso de cada año nuevo en la climatología
+        desviacion_minima (float): Desviación típica mínima (°C) usada en las
+            puntuaciones, para no alertar por diferencias insignificantes en
+            series casi constantes
+    """
+
+    def __init__(self, estacion=None, ventana=30, umbral_z=3.0, umbral_estacional=3.0,
+                 minimo_dias=7, minimo_anios=3, alfa=0.2, desviacion_minima=0.5, al_alertar=None):
+        """
+        Constructor del detector.
+
+        Args:
+            al_alertar (callable, optional): Función que recibe cada Alerta
+
+        Raises:
+            ValueError: Si la ventana o los parámetros no son válidos
+        """
+        if ventana < 2:
+            raise ValueError("La ventana debe tener al menos 2 días")
+        if not 0 < alfa <= 1:
+            raise ValueError("alfa debe estar en el intervalo (0, 1]")
+        self.estacion = estacion
+        self.ventana = ventana
+        self.umbral_z = umbral_z
+        self.umbral_estacional = umbral_estacional
+        self.minimo_dias = max(2, minimo_dias)
+        self.minimo_anios = minimo_anios
+        self.alfa = alfa
+        self.desviacion_minima = desviacion_minima
+        self.al_alertar = al_alertar
+        # Línea base móvil: valores de la ventana y sus sumas acumuladas
+        self._valores = deque(maxlen=ventana)
+        self._suma = 0.0
+        self._suma_cuadrados = 0.0
+        self._desde_recalculo = 0
+        # Climatología: media, varianza y observaciones de cada día del año
+        self._media_anual = [0.0] * _DIAS_ANIO
+        self._varianza_anual = [0.0] * _DIAS_ANIO
+        self._observaciones = [0] * _DIAS_ANIO
+
+    def procesar(self, temperatura, fecha=None):
+        """
+        Incorpora una lectura y devuelve las alertas que provoca.
+
+        Args:
+            temperatura (float | DiaClima): Temperatura del día (None o NaN si
+                no hay registro)
+            fecha (date, optional): Fecha de la lectura; sin ella solo se evalúa
+                la línea base móvil
+
+        Returns:
+            list: Alertas generadas (vacía si el día es normal)
+        """
+        if temperatura is not None and not isinstance(temperatura, (int, float)):
+            temperatura = temperatura.temperatura  # Objeto DiaClima
+        if temperatura is None or temperatura != temperatura:
+            # NaN es el centinela de día sin registro del archivo y de las series
+            return []
+        alertas = []
+        valores = self._valores
+
+        # Puntuación z respecto a la línea base móvil
+        n = len(valores)
+        if n >= self.minimo_dias:
+            media = self._suma / n
+            varianza = self._suma_cuadrados / n - media * media
+            desviacion = sqrt(varianza) if varianza > 0 else 0.0
+            if desviacion < self.desviacion_minima:
+                desviacion = self.desviacion_minima
+            z = (temperatura - media) / desviacion
+            if z > self.umbral_z or z < -self.umbral_z:
+                alertas.append(Alerta(self.estacion, fecha, temperatura, ALERTA_ZSCORE, z, media))
+
+        # Desviación respecto a la climatología del mismo día del año
+        if fecha is not None:
+            casilla = _dia_del_anio(fecha)
+            observaciones = self._observaciones[casilla]
+            media_anual = self._media_anual[casilla]
+            diferencia = temperatura - media_anual
+            if observaciones >= self.minimo_anios:
+                desviacion = sqrt(self._varianza_anual[casilla])
+                if desviacion < self.desviacion_minima:
+                    desviacion = self.desviacion_minima
+                z = diferencia / desviacion
+                if z > self.umbral_estacional or z < -self.umbral_estacional:
+                    alertas.append(Alerta(self.estacion, fecha, temperatura, ALERTA_ESTACIONAL, z, media_anual))
+            if observaciones:
+                incremento = self.alfa * diferencia
+                self._media_anual[casilla] = media_anual + incremento
+                self._varianza_anual[casilla] = (1 - self.alfa) * (self._varianza_anual[casilla] + diferencia * incremento)
+            else:
+                self._media_anual[casilla] = temperatura
+            self._observaciones[casilla] = observaciones + 1
+
+        # Actualizar la línea base móvil
+        if n == self.ventana:
+            saliente = valores[0]
+            self._suma -= saliente
+            self._suma_cuadrados -= saliente * saliente
+        valores.append(temperatura)
+        self._suma += temperatura
+        self._suma_cuadrados += temperatura * temperatura
+        self._desde_recalculo += 1
+        if self._desde_recalculo >= 64 * self.ventana:
+            # Recalcular de vez en cuando evita que se acumule error de redondeo
+            self._suma = sum(valores)
+            self._suma_cuadrados = sum(v * v for v in valores)
+            self._desde_recalculo = 0
+
+        if alertas and self.al_alertar is not None:
+            for alerta in alertas:
+                self.al_alertar(alerta)
+        return alertas
+
+    def detectar(self, lecturas):
+        """
+        Procesa un flujo de lecturas y genera las alertas a medida que aparecen.
+
+        Args:
+            lecturas (iterable): Pares (fecha, temperatura), objetos DiaClima o
+                temperaturas sueltas
+
+        Yields:
+            Alerta: Cada alerta detectada
+        """
+        procesar = self.procesar
+        for lectura in lecturas:
+            if isinstance(lectura, tuple):
+                alertas = procesar(lectura[1], lectura[0])
+            else:
+                alertas = procesar(lectura)
+            if alertas:
+                yield from alertas
+
+
+class MonitorAnomalias:
+    """
+    Agrupa un detector por estación y enruta cada lectura al suyo.
+
+    Atributos:
+        _detectores (dict): DetectorAnomalias de cada estación
+        _parametros (dict): Parámetros con los que se crean los detectores
+    """
+
+    def __init__(self, al_alertar=None, **parametros):
+        """
+        Constructor del monitor.
+
+        Args:
+            al_alertar (callable, optional): Función que recibe cada Alerta
+            **parametros: Parámetros de DetectorAnomalias para cada estación
+        """
+        self._detectores = {}
+        self._parametros = dict(parametros, al_alertar=al_alertar)
+
+    def detector(self, estacion):
+        """Devuelve el detector de una estación, creándolo si no existe."""
+        detector = self._detectores.get(estacion)
+        if detector is None:
+            detector = self._detectores[estacion] = DetectorAnomalias(estacion, **self._parametros)
+        return detector
+
+    def procesar(self, estacion, temperatura, fecha=None):
+        """Incorpora una lectura de una estación y devuelve sus alertas."""
+        return self.detector(estacion).procesar(temperatura, fecha)
+
+    def detectar(self, lecturas):
+        """
+        Procesa un flujo de lecturas de varias estaciones.
+
+        Args:
+            lecturas (iterable): Tuplas (estacion, fecha, temperatura)
+
+        Yields:
+            Alerta: Cada alerta detectada
+        """
+        for estacion, fecha, temperatura in lecturas:
+            alertas = self.detector(estacion).procesar(temperatura, fecha)
+            if alertas:
+                yield from alertas
@@ -0,0 +1,271 @@
+"""
+Archivo binario de temperaturas históricas con acceso mediante mmap.
+
+Formato (little-endian):
+    Cabecera de 64 bytes:
+        4 bytes   firma b"UEAC"
+        1 byte    versión del formato
+        1 byte    tipo de las lecturas: b"f" (float32) o b"d" (float64)
+        2 bytes   reservados
+        32 bytes  identificador de la estación (UTF-8, relleno con ceros)
+        4 bytes   fecha del primer día (ordinal de datetime.date)
+        8 bytes   número de días almacenados
+        12 bytes  reservados
+    Lecturas: una temperatura por día, consecutivas desde la fecha inicial.
+    Los días sin registro se guardan como NaN.
+
+Al abrir un archivo las lecturas no se copian: se exponen como un memoryview
+sobre el mapa de memoria, de modo que cualquier semana se obtiene por
+desplazamiento sin leer el resto del archivo.
+"""
+
+import math
+import mmap
+import struct
+from array import array
+from datetime import date
+
+from clima_calendario import dia_de_semana, dia_epoca
+from POO import DiaClima, SemanaClima
+
+
+FIRMA = b"UEAC"
+VERSION = 1
+TAM_CABECERA = 64
+_CABECERA = struct.Struct("<4sBc2x32siQ12x")
+_POS_DIAS = 44  # Desplazamiento del campo "número de días" en la cabecera
+_TIPOS = {"f": 4, "d": 8}
+
+# Valor centinela para los días sin registro
+VALOR_FALTANTE = math.nan
+
+
+class ArchivoClima:
+    """
+    Archivo de temperaturas diarias de una estación, abierto mediante mmap.
+
+    Atributos:
+        ruta (str): Ruta del archivo
+        estacion (str): Identificador de la estación
+        fecha_inicio (date): Fecha del primer día almacenado
+        tipo (str): Typecode de las lecturas ("f" o "d")
+    """
+
+    def __init__(self, ruta, modo="r"):
+        """
+        Abre un archivo existente.
+
+        Args:
+            ruta (str): Ruta del archivo
+            modo (str): "r" para solo lectura, "a" para permitir agregar días
+
+        Raises:
+            ValueError: Si el modo no es válido o el archivo no tiene el formato esperado
+        """
+        if modo not in ("r", "a"):
+            raise ValueError("El modo debe ser 'r' o 'a'")
+        self.ruta = ruta
+        self._modo = modo
+        self._archivo = open(ruta, "rb" if modo == "r" else "r+b")
+        try:
+            firma, version, tipo, estacion, inicio, dias = _CABECERA.unpack(
+                self._archivo.read(TAM_CABECERA))
+        except struct.error:
+            self._archivo.close()
+            raise ValueError(f"{ruta} no es un archivo de clima válido")
+        if firma != FIRMA or version != VERSION or tipo.decode("ascii", "replace") not in _TIPOS:
+            self._archivo.close()
+            raise ValueError(f"{ruta} no es un archivo de clima válido")
+        self.estacion = estacion.rstrip(b"\0").decode("utf-8")
+        self.fecha_inicio = date.fromordinal(inicio)
+        self.tipo = tipo.decode("ascii")
+        self._dias = dias
+        self._mapa = None
+        self._lecturas = None
+        self._mapear()
+
+    @classmethod
+    def crear(cls, ruta, estacion, fecha_inicio, temperaturas=(), tipo="d"):
+        """
+        Crea un archivo nuevo (sobrescribiendo el existente) y lo abre en modo "a".
+
+        Args:
+            ruta (str): Ruta del archivo
+            estacion (str): Identificador de la estación (máximo 32 bytes UTF-8)
+            fecha_inicio (date): Fecha del primer día
+            temperaturas (iterable): Temperaturas iniciales (None si no hay registro)
+            tipo (str): "f" para float32 o "d" para float64
+
+        Returns:
+            ArchivoClima: Archivo abierto en modo de agregado
+
+        Raises:
+            ValueError: Si el tipo no es válido o el identificador es demasiado largo
+        """
+        if tipo not in _TIPOS:
+            raise ValueError("El tipo debe ser 'f' (float32) o 'd' (float64)")
+        estacion_bytes = estacion.encode("utf-8")
+        if len(estacion_bytes) > 32:
+            raise ValueError("El identificador de la estación no puede superar 32 bytes")
+        lecturas = _empaquetar(temperaturas, tipo)
+        with open(ruta, "wb") as archivo:
+            archivo.write(_CABECERA.pack(FIRMA, VERSION, tipo.encode("ascii"), estacion_bytes,
+                                         fecha_inicio.toordinal(), len(lecturas)))
+            lecturas.tofile(archivo)
+        return cls(ruta, "a")
+
+    def _mapear(self):
+        """Mapea el archivo en memoria y expone las lecturas sin copiarlas."""
+        self._mapa = mmap.mmap(self._archivo.fileno(), TAM_CABECERA + self._dias * _TIPOS[self.tipo],
+                               access=mmap.ACCESS_READ)
+        self._lecturas = memoryview(self._mapa)[TAM_CABECERA:].cast(self.tipo)
+
+    def _desmapear(self):
+        """
+        Libera el mapa de memoria.
+
+        Raises:
+            BufferError: Si alguna vista entregada (lecturas, lecturas_semana)
+                sigue sin liberarse; el archivo queda mapeado y utilizable
+        """
+        if self._mapa is None:
+            return
+        error = "Hay vistas de las lecturas sin liberar (lecturas, lecturas_semana)"
+        try:
+            self._lecturas.release()
+        except BufferError:
+            raise BufferError(error) from None
+        try:
+            self._mapa.close()
+        except BufferError:
+            # Una rebanada entregada mantiene exportado el mapa: se restaura la vista
+            self._lecturas = memoryview(self._mapa)[TAM_CABECERA:].cast(self.tipo)
+            raise BufferError(error) from None
+        self._mapa = None
+        self._lecturas = None
+
+    @property
+    def fecha_fin(self):
+        """Fecha del último día almacenado (None si el archivo está vacío)."""
+        if not self._dias:
+            return None
+        return date.fromordinal(self.fecha_inicio.toordinal() + self._dias - 1)
+
+    @property
+    def lecturas(self):
+        """memoryview de solo lectura con todas las temperaturas (NaN = sin registro)."""
+        return self._lecturas
+
+    @property
+    def numero_semanas(self):
+        """Número de semanas (la última puede estar incompleta)."""
+        return -(-self._dias // 7)
+
+    def __len__(self):
+        """Número de días almacenados."""
+        return self._dias
+
+    def __getitem__(self, indice):
+        """
+        Devuelve la temperatura de un día, o None si no está registrada.
+
+        Args:
+            indice (int): Índice del día desde la fecha inicial
+        """
+        valor = self._lecturas[indice]
+        return None if valor != valor else valor
+
+    def indice_de_fecha(self, fecha):
+        """
+        Convierte una fecha en el índice de día correspondiente.
+
+        Raises:
+            IndexError: Si la fecha está fuera del rango almacenado
+        """
+        indice = fecha.toordinal() - self.fecha_inicio.toordinal()
+        if not 0 <= indice < self._dias:
+            raise IndexError("La fecha está fuera del rango del archivo")
+        return indice
+
+    def lecturas_semana(self, numero_semana):
+        """
+        Devuelve las lecturas de una semana sin copiarlas.
+
+        Args:
+            numero_semana (int): Índice de la semana desde la fecha inicial
+
+        Returns:
+            memoryview: Vista de hasta 7 lecturas
+
+        Raises:
+            IndexError: Si la semana no existe
+        """
+        if not 0 <= numero_semana < self.numero_semanas:
+            raise IndexError("La semana está fuera del rango del archivo")
+        inicio = numero_semana * 7
+        return self._lecturas[inicio:inicio + 7]
+
+    def semana(self, numero_semana):
+        """
+        Construye la SemanaClima de una semana almacenada.
+
+        Args:
+            numero_semana (int): Índice de la semana desde la fecha inicial
+
+        Cada día se numera por su día real de la semana (1 = Lunes), ya que
+        la fecha inicial del archivo no tiene por qué caer en lunes.
+
+        Returns:
+            SemanaClima: Semana con los días registrados y sin registrar
+        """
+        primer_dia = dia_de_semana(dia_epoca(self.fecha_inicio) + numero_semana * 7)
+        semana = SemanaClima()
+        for desplazamiento, valor in enumerate(self.lecturas_semana(numero_semana)):
+            semana.agregar_dia(DiaClima((primer_dia + desplazamiento) % 7 + 1,
+                                        None if valor != valor else valor))
+        return semana
+
+    def agregar_dias(self, temperaturas):
+        """
+        Agrega días nuevos al final del archivo.
+
+        Las vistas obtenidas antes de la llamada (lecturas, lecturas_semana)
+        deben haberse liberado, porque el archivo se vuelve a mapear.
+
+        Args:
+            temperaturas (iterable): Temperaturas nuevas (None si no hay registro)
+
+        Raises:
+            ValueError: Si el archivo se abrió en modo de solo lectura
+            BufferError: Si alguna vista entregada sigue sin liberarse (el
+                archivo no se modifica)
+        """
+        if self._modo != "a":
+            raise ValueError("El archivo se abrió en modo de solo lectura")
+        nuevas = _empaquetar(temperaturas, self.tipo)
+        if not nuevas:
+            return
+        self._desmapear()
+        self._archivo.seek(TAM_CABECERA + self._dias * _TIPOS[self.tipo])
+        nuevas.tofile(self._archivo)
+        self._dias += len(nuevas)
+        self._archivo.seek(_POS_DIAS)
+        self._archivo.write(struct.pack("<Q", self._dias))
+        self._archivo.flush()
+        self._mapear()
+
+    def cerrar(self):
+        """Cierra el mapa de memoria y el archivo."""
+        self._desmapear()
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+def _empaquetar(temperaturas, tipo):
+    """Convierte temperaturas (None = sin registro) en un array del tipo indicado."""
+    return array(tipo, (VALOR_FALTANTE if valor is None else float(valor) for valor in temperaturas))
@@ -0,0 +1,251 @@
+"""
+Banco de pruebas de rendimiento del subsistema de clima.
+
+Simula la entrada no interactiva a gran escala y mide, por operación:
+    * Tiempo en nanosegundos (mejor de varias repeticiones).
+    * Memoria asignada según tracemalloc (pico y memoria retenida por operación).
+    * RSS máximo del proceso al terminar.
+
+Opcionalmente guarda un perfil de cProfile de las rutas calientes y compara
+los resultados con una línea base guardada en JSON.
+
+Uso:
+    python clima_benchmark.py
+    python clima_benchmark.py -n 200000 --operaciones setter calcular_promedio
+    python clima_benchmark.py --guardar-base base.json
+    python clima_benchmark.py --comparar base.json --tolerancia 10
+    python clima_benchmark.py --perfil perfil.prof
+"""
+
+import argparse
+import builtins
+import contextlib
+import cProfile
+import gc
+import io
+import json
+import pstats
+import sys
+import time
+import tracemalloc
+
+from POO import DiaClima, SemanaClima
+
+try:
+    import resource
+except ImportError:  # Windows no tiene el módulo resource
+    resource = None
+
+
+def _temperaturas(n):
+    """Temperaturas de prueba deterministas en formato texto, como las teclearía un usuario."""
+    return [f"{(i * 7919) % 4000 / 100 - 5:.2f}" for i in range(n)]
+
+
+def _preparar_creacion(n):
+    """Crear n objetos DiaClima."""
+    numeros = [i % 7 + 1 for i in range(n)]
+
+    def ejecutar():
+        for numero in numeros:
+            DiaClima(numero)
+    return ejecutar
+
+
+def _preparar_setter(n):
+    """Asignar n temperaturas en texto mediante el setter con validación."""
+    valores = _temperaturas(n)
+    dia = DiaClima(1)
+
+    def ejecutar():
+        for valor in valores:
+            dia.temperatura = valor
+    return ejecutar
+
+
+def _preparar_agregar_dia(n):
+    """Agregar n días a una semana (incluye la comprobación isinstance)."""
+    dias = [DiaClima(i % 7 + 1, 20.0) for i in range(n)]
+
+    def ejecutar():
+        semana = SemanaClima()
+        for dia in dias:
+            semana.agregar_dia(dia)
+    return ejecutar
+
+
+def _preparar_calcular_promedio(n):
+    """Calcular el promedio de n/7 semanas de 7 días."""
+    semanas = [SemanaClima.desde_temperaturas([20.0 + d for d in range(7)]) for _ in range(max(1, n // 7))]
+
+    def ejecutar():
+        for semana in semanas:
+            semana.calcular_promedio()
+    return ejecutar
+
+
+def _preparar_mostrar_resumen(n):
+    """Mostrar el resumen de n/7 semanas con la salida redirigida a memoria."""
+    semanas = [SemanaClima.desde_temperaturas([20.0 + d for d in range(7)]) for _ in range(max(1, n // 7))]
+
+    def ejecutar():
+        with contextlib.redirect_stdout(io.StringIO()):
+            for semana in semanas:
+                semana.mostrar_resumen()
+    return ejecutar
+
+
+def _preparar_ingreso_manual(n):
+    """Ingresar n/7 semanas por consola simulando la entrada con respuestas precargadas."""
+    semanas = max(1, n // 7)
+    respuestas = _temperaturas(semanas * 7)
+
+    def ejecutar():
+        entrada = iter(respuestas)
+        original = builtins.input
+        builtins.input = lambda prompt="": next(entrada)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(semanas):
+                    SemanaClima().ingresar_temperaturas_manual()
+        finally:
+            builtins.input = original
+    return ejecutar
+
+
+# Operación -> (función de preparación, elementos de n por cada operación medida)
+OPERACIONES = {
+    "creacion": (_preparar_creacion, 1),
+    "setter": (_preparar_setter, 1),
+    "agregar_dia": (_preparar_agregar_dia, 1),
+    "calcular_promedio": (_preparar_calcular_promedio, 7),
+    "mostrar_resumen": (_preparar_mostrar_resumen, 7),
+    "ingreso_manual": (_preparar_ingreso_manual, 1),
+}
+
+
+def _rss_maximo_kb():
+    """RSS máximo del proceso en KiB, o None si no se puede medir."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS lo informa en bytes, Linux en KiB
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def medir(nombre, n, repeticiones=3):
+    """
+    Mide una operación.
+
+    Args:
+        nombre (str): Clave de OPERACIONES
+        n (int): Tamaño de la carga simulada
+        repeticiones (int): Ejecuciones cronometradas (se toma la mejor)
+
+    Returns:
+        dict: ns por operación, bytes pico y retenidos por operación
+    """
+    preparar, divisor = OPERACIONES[nombre]
+    ejecutar = preparar(n)
+    operaciones = max(1, n // divisor)
+
+    mejor = None
+    gc.collect()
+    for _ in range(repeticiones):
+        inicio = time.perf_counter_ns()
+        ejecutar()
+        transcurrido = time.perf_counter_ns() - inicio
+        mejor = transcurrido if mejor is None else min(mejor, transcurrido)
+
+    gc.collect()
+    tracemalloc.start()
+    antes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    ejecutar()
+    despues, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'operaciones': operaciones,
+        'ns_por_op': round(mejor / operaciones, 1),
+        'pico_bytes_por_op': round((pico - antes) / operaciones, 1),
+        'retenidos_bytes_por_op': round((despues - antes) / operaciones, 1),
+    }
+
+
+def perfilar(nombres, n, ruta):
+    """Ejecuta las operaciones bajo cProfile, guarda el perfil y muestra las rutas calientes."""
+    ejecutores = [OPERACIONES[nombre][0](n) for nombre in nombres]
+    perfil = cProfile.Profile()
+    perfil.enable()
+    for ejecutar in ejecutores:
+        ejecutar()
+    perfil.disable()
+    perfil.dump_stats(ruta)
+    print(f"\nPerfil guardado en {ruta}. Rutas más costosas:")
+    pstats.Stats(perfil).sort_stats("cumulative").print_stats(15)
+
+
+def comparar_con_base(resultados, base, tolerancia):
+    """
+    Compara los ns por operación con una línea base.
+
+    Returns:
+        list: Nombres de las operaciones más lentas que la tolerancia (%)
+    """
+    regresiones = []
+    print(f"\n{'Operación':<20} {'Base (ns)':>12} {'Actual (ns)':>12} {'Cambio':>9}")
+    for nombre, actual in resultados.items():
+        anterior = base.get(nombre)
+        if anterior is None:
+            print(f"{nombre:<20} {'-':>12} {actual['ns_por_op']:>12} {'nueva':>9}")
+            continue
+        cambio = (actual['ns_por_op'] - anterior['ns_por_op']) / anterior['ns_por_op'] * 100
+        marca = " <-- regresión" if cambio > tolerancia else ""
+        print(f"{nombre:<20} {anterior['ns_por_op']:>12} {actual['ns_por_op']:>12} {cambio:>+8.1f}%{marca}")
+        if cambio > tolerancia:
+            regresiones.append(nombre)
+    return regresiones
+
+
+def main(argumentos=None):
+    """Punto de entrada del banco de pruebas."""
+    parser = argparse.ArgumentParser(description="Banco de pruebas del subsistema de clima")
+    parser.add_argument("-n", type=int, default=100_000, help="Tamaño de la carga simulada (por defecto 100000)")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Ejecuciones cronometradas por operación")
+    parser.add_argument("--operaciones", nargs="+", choices=list(OPERACIONES), default=list(OPERACIONES),
+                        help="Operaciones a medir")
+    parser.add_argument("--perfil", metavar="RUTA", help="Guardar un perfil de cProfile en RUTA")
+    parser.add_argument("--guardar-base", metavar="RUTA", help="Guardar los resultados como línea base JSON")
+    parser.add_argument("--comparar", metavar="RUTA", help="Comparar con una línea base JSON")
+    parser.add_argument("--tolerancia", type=float, default=10.0,
+                        help="Porcentaje de empeoramiento considerado regresión (por defecto 10)")
+    opciones = parser.parse_args(argumentos)
+
+    resultados = {}
+    print(f"{'Operación':<20} {'ns/op':>10} {'pico B/op':>11} {'retenidos B/op':>15}")
+    for nombre in opciones.operaciones:
+        r = resultados[nombre] = medir(nombre, opciones.n, opciones.repeticiones)
+        print(f"{nombre:<20} {r['ns_por_op']:>10} {r['pico_bytes_por_op']:>11} {r['retenidos_bytes_por_op']:>15}")
+    rss = _rss_maximo_kb()
+    print(f"\nRSS máximo: {rss} KiB" if rss is not None else "\nRSS máximo: no disponible en esta plataforma")
+
+    if opciones.perfil:
+        perfilar(opciones.operaciones, opciones.n, opciones.perfil)
+
+    codigo = 0
+    if opciones.comparar:
+        with open(opciones.comparar, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        if comparar_con_base(resultados, base.get("resultados", {}), opciones.tolerancia):
+            codigo = 1
+    if opciones.guardar_base:
+        with open(opciones.guardar_base, "w", encoding="utf-8") as archivo:
+            json.dump({"n": opciones.n, "rss_maximo_kb": rss, "resultados": resultados}, archivo, indent=2)
+        print(f"\nLínea base guardada en {opciones.guardar_base}")
+    return codigo
+
+
+# Punto de entrada del programa
+if __name__ == "__main__":
+    sys.exit(main())
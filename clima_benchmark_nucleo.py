@@ -0,0 +1,79 @@
+"""
+Comparación de rendimiento del núcleo de cálculo del clima.
+
+Mide el camino de Programación Tradicional (lista de floats) frente al camino
+POO (objetos DiaClima dentro de una SemanaClima) con el mismo núcleo. La
+paridad con las implementaciones originales se comprueba en
+tests/test_clima_nucleo.py.
+
+Uso:
+    python clima_benchmark_nucleo.py
+    python clima_benchmark_nucleo.py --tamanos 7 10000 --repeticiones 5
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from POO import SemanaClima
+from ProgramacionTradicional import calcular_promedio_semanal
+from clima_nucleo import clasificar_clima
+
+
+# Tamaños medidos por defecto: una semana, ~27 años y ~27 000 años de días
+TAMANOS = (7, 10_000, 10_000_000)
+
+
+def _medir(funcion, repeticiones):
+    """Devuelve el mejor tiempo (en segundos) de varias ejecuciones."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def comparar(tamano, repeticiones, semilla=7):
+    """
+    Mide ambos caminos para una serie del tamaño indicado.
+
+    Returns:
+        dict: Tiempos (s) de cálculo y de construcción de objetos
+    """
+    generador = random.Random(semilla)
+    temperaturas = [generador.uniform(-20, 45) for _ in range(tamano)]
+    inicio = time.perf_counter()
+    semana = SemanaClima.desde_temperaturas(temperaturas)
+    construccion = time.perf_counter() - inicio
+    resultado = {
+        'tamano': tamano,
+        'lista': _medir(lambda: clasificar_clima(calcular_promedio_semanal(temperaturas)), repeticiones),
+        'objetos': _medir(lambda: semana.clasificar_clima(semana.calcular_promedio()), repeticiones),
+        'construccion': construccion,
+    }
+    assert calcular_promedio_semanal(temperaturas) == semana.calcular_promedio()
+    return resultado
+
+
+def main(argumentos=None):
+    """Punto de entrada de la comparación."""
+    parser = argparse.ArgumentParser(description="Rendimiento del núcleo de clima")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=list(TAMANOS),
+                        help="Número de lecturas de cada serie medida")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Ejecuciones por medida (se toma la mejor)")
+    opciones = parser.parse_args(argumentos)
+
+    print(f"{'Lecturas':>12} {'Lista (µs)':>14} {'DiaClima (µs)':>15} {'Relación':>9} {'Creación DiaClima (ms)':>23}")
+    for tamano in opciones.tamanos:
+        r = comparar(tamano, opciones.repeticiones)
+        relacion = r['objetos'] / r['lista'] if r['lista'] else float("inf")
+        print(f"{tamano:>12} {r['lista'] * 1e6:>14.1f} {r['objetos'] * 1e6:>15.1f} "
+              f"{relacion:>8.1f}x {r['construccion'] * 1e3:>23.1f}")
+    return 0
+
+
+# Punto de entrada del programa
+if __name__ == "__main__":
+    sys.exit(main())
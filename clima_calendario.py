@@ -0,0 +1,290 @@
+"""
+Modelo de calendario indexado por días de época para series de temperaturas.
+
+Las fechas se representan como enteros (días desde el 1970-01-01), de modo que
+el día de la semana, la semana ISO, el mes y el año de cada lectura se obtienen
+con aritmética en lugar de guardar un texto por objeto. Los nombres de los días
+viven en una única tabla compartida.
+"""
+
+import sys
+from array import array
+from datetime import date
+
+from clima_cuantiles import BosquejoCuantiles
+
+
+# Tabla compartida con los nombres de los días (Lunes = índice 0)
+NOMBRES_DIAS = tuple(sys.intern(nombre) for nombre in
+                     ("Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"))
+
+EPOCA = date(1970, 1, 1)
+_ORDINAL_EPOCA = EPOCA.toordinal()
+
+PERIODOS = ("semana", "mes", "anio")
+
+
+def nombre_dia(numero_dia):
+    """
+    Devuelve el nombre de un día de la semana numerado de 1 (Lunes) a 7 (Domingo).
+
+    Args:
+        numero_dia (int): Número del día
+
+    Returns:
+        str: Nombre compartido del día, o "Día N" fuera del rango 1-7
+    """
+    if 1 <= numero_dia <= 7:
+        return NOMBRES_DIAS[numero_dia - 1]
+    return f"Día {numero_dia}"
+
+
+def dia_epoca(fecha):
+    """Convierte una fecha (o un entero ya convertido) en días desde 1970-01-01."""
+    if isinstance(fecha, int):
+        return fecha
+    return fecha.toordinal() - _ORDINAL_EPOCA
+
+
+def fecha_de_dia(dia):
+    """Convierte días desde 1970-01-01 en una fecha."""
+    return date.fromordinal(dia + _ORDINAL_EPOCA)
+
+
+def dia_de_semana(dia):
+    """Día de la semana (0 = Lunes) de un día de época; 1970-01-01 fue jueves."""
+    return (dia + 3) % 7
+
+
+def semana_epoca(dia):
+    """Índice de la semana (de lunes a domingo) que contiene un día de época."""
+    return (dia + 3) // 7
+
+
+def dia_desde_civil(anio, mes, dia):
+    """
+    Días de época de una fecha civil sin crear objetos date.
+
+    Algoritmo "days_from_civil" de H. Hinnant.
+    """
+    anio -= mes <= 2
+    era = anio // 400
+    anio_era = anio - era * 400
+    dia_anio = (153 * (mes + (-3 if mes > 2 else 9)) + 2) // 5 + dia - 1
+    dia_era = anio_era * 365 + anio_era // 4 - anio_era // 100 + dia_anio
+    return era * 146097 + dia_era - 719468
+
+
+def civil_desde_dia(dia):
+    """
+    Fecha civil (anio, mes, dia) de un día de época sin crear objetos date.
+
+    Algoritmo "civil_from_days" de H. Hinnant.
+    """
+    z = dia + 719468
+    era = z // 146097
+    dia_era = z - era * 146097
+    anio_era = (dia_era - dia_era // 1460 + dia_era // 36524 - dia_era // 146096) // 365
+    dia_anio = dia_era - (365 * anio_era + anio_era // 4 - anio_era // 100)
+    mp = (5 * dia_anio + 2) // 153
+    dia_mes = dia_anio - (153 * mp + 2) // 5 + 1
+    mes = mp + 3 if mp < 10 else mp - 9
+    return anio_era + era * 400 + (mes <= 2), mes, dia_mes
+
+
+def semana_iso(dia):
+    """
+    Semana ISO (anio_iso, semana) de un día de época.
+
+    La semana ISO pertenece al año de su jueves.
+    """
+    jueves = dia - dia_de_semana(dia) + 3
+    anio = civil_desde_dia(jueves)[0]
+    return anio, (jueves - dia_desde_civil(anio, 1, 1)) // 7 + 1
+
+
+def clave_periodo(dia, periodo):
+    """
+    Clave del periodo que contiene un día de época.
+
+    Args:
+        dia (int): Día de época
+        periodo (str): "semana" (ISO), "mes" o "anio"
+
+    Returns:
+        tuple | int: (anio_iso, semana), (anio, mes) o anio
+    """
+    if periodo == "semana":
+        return semana_iso(dia)
+    anio, mes, _ = civil_desde_dia(dia)
+    if periodo == "mes":
+        return anio, mes
+    if periodo == "anio":
+        return anio
+    raise ValueError(f"Periodo no válido: {periodo!r}")
+
+
+def inicio_periodo_siguiente(dia, periodo):
+    """Primer día de época del periodo siguiente al que contiene `dia`."""
+    if periodo == "semana":
+        return dia - dia_de_semana(dia) + 7
+    anio, mes, _ = civil_desde_dia(dia)
+    if periodo == "mes":
+        return dia_desde_civil(anio + (mes == 12), mes % 12 + 1, 1)
+    if periodo == "anio":
+        return dia_desde_civil(anio + 1, 1, 1)
+    raise ValueError(f"Periodo no válido: {periodo!r}")
+
+
+class SerieCalendario:
+    """
+    Serie de temperaturas diarias consecutivas anclada a un día de época.
+
+    Las temperaturas se guardan empaquetadas en un array de floats (NaN para
+    los días sin registro), sin un objeto por día.
+
+    Atributos:
+        dia_inicio (int): Día de época de la primera lectura
+    """
+
+    def __init__(self, inicio, temperaturas=()):
+        """
+        Constructor de la serie.
+
+        Args:
+            inicio (date | int): Fecha o día de época de la primera lectura
+            temperaturas (iterable): Temperaturas (None si no hay registro)
+        """
+        self.dia_inicio = dia_epoca(inicio)
+        self._temperaturas = array("d")
+        self.extender(temperaturas)
+
+    def extender(self, temperaturas):
+        """Agrega temperaturas al final de la serie (None si no hay registro)."""
+        nan = float("nan")
+        self._temperaturas.extend(nan if t is None else float(t) for t in temperaturas)
+
+    def agregar(self, temperatura):
+        """Agrega la temperatura del día siguiente."""
+        self._temperaturas.append(float("nan") if temperatura is None else float(temperatura))
+
+    def __len__(self):
+        """Número de días de la serie."""
+        return len(self._temperaturas)
+
+    @property
+    def dia_fin(self):
+        """Día de época de la última lectura (inclusive)."""
+        return self.dia_inicio + len(self._temperaturas) - 1
+
+    def temperatura(self, dia):
+        """
+        Temperatura de un día (fecha o día de época), o None si no está registrada.
+
+        Raises:
+            IndexError: Si el día está fuera de la serie
+        """
+        indice = dia_epoca(dia) - self.dia_inicio
+        if not 0 <= indice < len(self._temperaturas):
+            raise IndexError("El día está fuera de la serie")
+        valor = self._temperaturas[indice]
+        return None if valor != valor else valor
+
+    def rebanada(self, desde, hasta):
+        """
+        Devuelve la subserie entre dos días, ambos incluidos.
+
+        Args:
+            desde (date | int): Primer día
+            hasta (date | int): Último día
+
+        Returns:
+            SerieCalendario: Subserie recortada a los límites de la serie
+        """
+        inicio = max(dia_epoca(desde), self.dia_inicio)
+        fin = min(dia_epoca(hasta), self.dia_fin)
+        serie = SerieCalendario(inicio)
+        if inicio <= fin:
+            serie._temperaturas = self._temperaturas[inicio - self.dia_inicio:fin - self.dia_inicio + 1]
+        return serie
+
+    def agrupar(self, periodo="semana"):
+        """
+        Recorre la serie por periodos consecutivos calculando los límites por aritmética.
+
+        Args:
+            periodo (str): "semana" (ISO), "mes" o "anio"
+
+        Cada periodo se entrega como una copia (array), no como una vista:
+        una vista exportada impediría agregar días a la serie mientras el
+        recorrido siga abierto o el llamador conserve algún periodo.
+
+        Yields:
+            tuple: (clave del periodo, array con las temperaturas del periodo)
+        """
+        temperaturas = self._temperaturas
+        dia = self.dia_inicio
+        fin = self.dia_fin
+        while dia <= fin:
+            siguiente = min(inicio_periodo_siguiente(dia, periodo), fin + 1)
+            yield clave_periodo(dia, periodo), temperaturas[dia - self.dia_inicio:siguiente - self.dia_inicio]
+            dia = siguiente
+
+    def promedios(self, periodo="semana"):
+        """
+        Promedio de cada periodo de la serie, redondeado a 2 decimales.
+
+        Returns:
+            list: Pares (clave, promedio), con promedio None si el periodo no
+                tiene temperaturas registradas
+        """
+        resultado = []
+        for clave, valores in self.agrupar(periodo):
+            registradas = [valor for valor in valores if valor == valor]
+            promedio = round(sum(registradas) / len(registradas), 2) if registradas else None
+            resultado.append((clave, promedio))
+        return resultado
+
+    def bosquejos(self, periodo="mes", k=200):
+        """
+        Bosquejo de cuantiles de cada periodo, para medianas y percentiles
+        por mes o por año sin ordenar todo el historial.
+
+        Args:
+            periodo (str): "semana" (ISO), "mes" o "anio"
+            k (int): Parámetro de precisión de cada bosquejo
+
+        Returns:
+            dict: BosquejoCuantiles de cada clave de periodo
+        """
+        resultado = {}
+        for clave, valores in self.agrupar(periodo):
+            bosquejo = BosquejoCuantiles(k)
+            bosquejo.extender(valor for valor in valores if valor == valor)
+            resultado[clave] = bosquejo
+        return resultado
+
+    def semana_clima(self, dia):
+        """
+        Construye la SemanaClima (de lunes a domingo) que contiene un día.
+
+        Los días de la semana fuera de la serie no se incluyen, por lo que la
+        numeración de cada DiaClima corresponde siempre a su día real.
+
+        Args:
+            dia (date | int): Cualquier día de la semana deseada
+
+        Returns:
+            SemanaClima: Semana con los días presentes en la serie
+        """
+        from POO import DiaClima, SemanaClima
+
+        dia = dia_epoca(dia)
+        lunes = dia - dia_de_semana(dia)
+        semana = SemanaClima()
+        for desplazamiento in range(7):
+            indice = lunes + desplazamiento - self.dia_inicio
+            if 0 <= indice < len(self._temperaturas):
+                valor = self._temperaturas[indice]
+                semana.agregar_dia(DiaClima(desplazamiento + 1, None if valor != valor else valor))
+        return semana
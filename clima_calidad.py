@@ -0,0 +1,164 @@
+"""
+Etapa de limpieza de temperaturas previa a SemanaClima.
+
+Recibe un flujo de lecturas diarias (fecha o día de época, temperatura) que
+puede traer duplicados, llegadas tardías y huecos, y en una sola pasada con
+memoria acotada:
+    * Reordena las lecturas con un buffer de tamaño fijo.
+    * Descarta duplicados de un mismo día (conservando la primera o la última).
+    * Rellena los días faltantes con la interpolación configurada.
+"""
+
+import heapq
+from collections import namedtuple
+
+from POO import DiaClima, SemanaClima
+from clima_calendario import dia_de_semana, dia_epoca, semana_iso
+
+
+# Lectura limpia: día de época, temperatura (None si no se rellenó) y si fue rellenada
+Lectura = namedtuple("Lectura", ["dia", "temperatura", "rellenada"])
+
+INTERPOLACIONES = ("lineal", "anterior", "ninguna")
+
+
+class LimpiadorTemperaturas:
+    """
+    Limpia un flujo de lecturas diarias en una sola pasada.
+
+    Atributos:
+        tam_buffer (int): Lecturas retenidas para reordenar llegadas tardías
+        interpolacion (str): "lineal", "anterior" (repite el último valor) o
+            "ninguna" (los días faltantes se emiten con temperatura None)
+        max_hueco (int): Huecos más largos que esto no se rellenan (None = sin límite)
+        conservar (str): "primera" o "ultima" lectura de un día duplicado
+        duplicadas (int): Lecturas descartadas por duplicadas
+        tardias (int): Lecturas descartadas por llegar después de emitir su día
+        rellenadas (int): Días generados para cubrir huecos
+    """
+
+    def __init__(self, tam_buffer=7, interpolacion="lineal", max_hueco=None, conservar="primera"):
+        """
+        Constructor del limpiador.
+
+        Raises:
+            ValueError: Si algún parámetro no es válido
+        """
+        if tam_buffer < 1:
+            raise ValueError("El buffer debe admitir al menos una lectura")
+        if interpolacion not in INTERPOLACIONES:
+            raise ValueError(f"Interpolación no válida: {interpolacion!r}")
+        if conservar not in ("primera", "ultima"):
+            raise ValueError("conservar debe ser 'primera' o 'ultima'")
+        self.tam_buffer = tam_buffer
+        self.interpolacion = interpolacion
+        self.max_hueco = max_hueco
+        self.conservar = conservar
+        self.duplicadas = 0
+        self.tardias = 0
+        self.rellenadas = 0
+        self._pendientes = {}
+        self._monticulo = []
+        self._ultimo_dia = None
+        self._ultima_temperatura = None
+
+    def agregar(self, fecha, temperatura):
+        """
+        Incorpora una lectura y devuelve las lecturas limpias que quedan listas.
+
+        Args:
+            fecha (date | int): Fecha o día de época de la lectura
+            temperatura (float): Temperatura (None se trata como día sin registro)
+
+        Returns:
+            list: Lecturas limpias en orden cronológico
+        """
+        if temperatura is None:
+            return []
+        dia = dia_epoca(fecha)
+        if self._ultimo_dia is not None and dia <= self._ultimo_dia:
+            # El día ya se emitió: es un duplicado o una llegada demasiado tardía
+            if dia == self._ultimo_dia:
+                self.duplicadas += 1
+            else:
+                self.tardias += 1
+            return []
+        if dia in self._pendientes:
+            self.duplicadas += 1
+            if self.conservar == "ultima":
+                self._pendientes[dia] = float(temperatura)
+            return []
+        self._pendientes[dia] = float(temperatura)
+        heapq.heappush(self._monticulo, dia)
+        listas = []
+        while len(self._monticulo) > self.tam_buffer:
+            self._emitir(listas)
+        return listas
+
+    def vaciar(self):
+        """Emite todas las lecturas retenidas (al final del flujo)."""
+        listas = []
+        while self._monticulo:
+            self._emitir(listas)
+        return listas
+
+    def _emitir(self, listas):
+        """Saca la lectura más antigua del buffer, rellenando el hueco previo."""
+        dia = heapq.heappop(self._monticulo)
+        temperatura = self._pendientes.pop(dia)
+        anterior = self._ultimo_dia
+        if anterior is not None and dia - anterior > 1:
+            self._rellenar(anterior, self._ultima_temperatura, dia, temperatura, listas)
+        listas.append(Lectura(dia, temperatura, False))
+        self._ultimo_dia = dia
+        self._ultima_temperatura = temperatura
+
+    def _rellenar(self, dia_a, valor_a, dia_b, valor_b, listas):
+        """Genera los días entre dia_a y dia_b (ambos excluidos)."""
+        hueco = dia_b - dia_a - 1
+        rellenar = self.interpolacion != "ninguna" and (self.max_hueco is None or hueco <= self.max_hueco)
+        pendiente = (valor_b - valor_a) / (dia_b - dia_a)
+        for dia in range(dia_a + 1, dia_b):
+            if not rellenar:
+                valor = None
+            elif self.interpolacion == "lineal":
+                valor = round(valor_a + pendiente * (dia - dia_a), 2)
+            else:
+                valor = valor_a
+            listas.append(Lectura(dia, valor, True))
+        self.rellenadas += hueco
+
+    def limpiar(self, lecturas):
+        """
+        Limpia un flujo completo de lecturas.
+
+        Args:
+            lecturas (iterable): Pares (fecha o día de época, temperatura)
+
+        Yields:
+            Lectura: Lecturas limpias, consecutivas y sin duplicados
+        """
+        for fecha, temperatura in lecturas:
+            yield from self.agregar(fecha, temperatura)
+        yield from self.vaciar()
+
+    def semanas(self, lecturas):
+        """
+        Limpia un flujo y lo agrupa en objetos SemanaClima de lunes a domingo.
+
+        Args:
+            lecturas (iterable): Pares (fecha o día de época, temperatura)
+
+        Yields:
+            tuple: ((anio_iso, semana), SemanaClima) de cada semana con datos
+        """
+        clave = semana = None
+        for lectura in self.limpiar(lecturas):
+            clave_actual = semana_iso(lectura.dia)
+            if clave_actual != clave:
+                if semana is not None:
+                    yield clave, semana
+                clave, semana = clave_actual, SemanaClima()
+            semana.agregar_dia(DiaClima(dia_de_semana(lectura.dia) + 1, lectura.temperatura))
+        if semana is not None:
+            yield clave, semana
@@ -0,0 +1,205 @@
+"""
+Cuantiles aproximados (mediana, p5, p95, ...) sobre historiales largos de temperaturas.
+
+Implementa un bosquejo KLL (Karnin, Lang y Liberty, 2016): una pila de
+compactadores donde cada nivel guarda elementos con peso 2^nivel. Cuando un
+nivel se llena se ordena y la mitad de sus elementos (los pares o los
+impares, al azar) sube al nivel siguiente. La memoria es O(k) sin importar
+cuántas temperaturas se agreguen, y dos bosquejos de estaciones o periodos
+distintos se combinan juntando sus niveles.
+
+Error: con probabilidad ~99 % el rango de cada cuantil se desvía como mucho
+unos 2.3 / k^0.97 del rango exacto (≈ 1.3 % con k = 200).
+"""
+
+import random
+from math import ceil
+
+
+_FACTOR_CAPACIDAD = 2 / 3
+
+
+class BosquejoCuantiles:
+    """
+    Bosquejo KLL combinable para estimar cuantiles de temperaturas.
+
+    Atributos:
+        k (int): Parámetro de precisión (mayor k, menor error y más memoria)
+        conteo (int): Temperaturas agregadas (exacto)
+        minimo (float): Temperatura mínima (exacta), o None si está vacío
+        maximo (float): Temperatura máxima (exacta), o None si está vacío
+    """
+
+    def __init__(self, k=200, semilla=None):
+        """
+        Constructor del bosquejo.
+
+        Args:
+            k (int): Parámetro de precisión (al menos 8)
+            semilla (int, optional): Semilla para compactaciones reproducibles
+
+        Raises:
+            ValueError: Si k es demasiado pequeño
+        """
+        if k < 8:
+            raise ValueError("k debe ser al menos 8")
+        self.k = k
+        self.conteo = 0
+        self.minimo = None
+        self.maximo = None
+        self._azar = random.Random(semilla)
+        self._niveles = [[]]
+        self._tam = 0
+        self._tam_maximo = self._capacidad(0)
+
+    def _capacidad(self, nivel):
+        """Capacidad de un nivel: los niveles altos son los más grandes."""
+        altura = len(self._niveles) - nivel - 1
+        return int(ceil(self.k * _FACTOR_CAPACIDAD ** altura)) + 1
+
+    def _recalcular_tam_maximo(self):
+        """Actualiza la capacidad total tras agregar un nivel."""
+        self._tam_maximo = sum(self._capacidad(nivel) for nivel in range(len(self._niveles)))
+
+    def agregar(self, temperatura):
+        """
+        Agrega una temperatura (los None se ignoran como días sin registro).
+
+        Args:
+            temperatura (float): Temperatura a incorporar
+        """
+        if temperatura is None:
+            return
+        if self.conteo:
+            if temperatura < self.minimo:
+                self.minimo = temperatura
+            elif temperatura > self.maximo:
+                self.maximo = temperatura
+        else:
+            self.minimo = self.maximo = temperatura
+        self.conteo += 1
+        self._niveles[0].append(temperatura)
+        self._tam += 1
+        if self._tam >= self._tam_maximo:
+            self._compactar()
+
+    def extender(self, temperaturas):
+        """Agrega varias temperaturas."""
+        for temperatura in temperaturas:
+            self.agregar(temperatura)
+
+    def _compactar(self):
+        """Compacta el nivel más bajo que supere su capacidad."""
+        for nivel, elementos in enumerate(self._niveles):
+            if len(elementos) >= self._capacidad(nivel):
+                if nivel + 1 == len(self._niveles):
+                    self._niveles.append([])
+                    self._recalcular_tam_maximo()
+                elementos.sort()
+                # Con un número impar de elementos, uno se queda en el nivel
+                resto = elementos[:1] if len(elementos) % 2 else []
+                inicio = len(resto) + self._azar.randint(0, 1)
+                self._niveles[nivel + 1].extend(elementos[inicio::2])
+                self._niveles[nivel] = resto
+                self._tam = sum(len(n) for n in self._niveles)
+                return
+
+    def combinar(self, otro):
+        """
+        Combina este bosquejo con el de otra estación o periodo.
+
+        Args:
+            otro (BosquejoCuantiles): Bosquejo a incorporar
+
+        Returns:
+            BosquejoCuantiles: Nuevo bosquejo que resume ambos conjuntos
+        """
+        combinado = BosquejoCuantiles(min(self.k, otro.k), self._azar.randrange(2 ** 32))
+        combinado.conteo = self.conteo + otro.conteo
+        extremos = [b for b in (self, otro) if b.conteo]
+        if extremos:
+            combinado.minimo = min(b.minimo for b in extremos)
+            combinado.maximo = max(b.maximo for b in extremos)
+        alto = max(len(self._niveles), len(otro._niveles))
+        combinado._niveles = [[] for _ in range(alto)]
+        for bosquejo in (self, otro):
+            for nivel, elementos in enumerate(bosquejo._niveles):
+                combinado._niveles[nivel].extend(elementos)
+        combinado._recalcular_tam_maximo()
+        combinado._tam = sum(len(n) for n in combinado._niveles)
+        while combinado._tam >= combinado._tam_maximo:
+            combinado._compactar()
+        return combinado
+
+    def _ponderados(self):
+        """Elementos guardados con su peso, ordenados por valor."""
+        return sorted((valor, 1 << nivel) for nivel, elementos in enumerate(self._niveles)
+                      for valor in elementos)
+
+    def cuantiles(self, qs):
+        """
+        Estima varios cuantiles con una sola ordenación.
+
+        Args:
+            qs (iterable): Fracciones entre 0 y 1 (0.5 = mediana)
+
+        Returns:
+            list: Temperatura estimada de cada cuantil
+
+        Raises:
+            ValueError: Si el bosquejo está vacío o alguna fracción no es válida
+        """
+        qs = list(qs)
+        if not self.conteo:
+            raise ValueError("No hay temperaturas registradas para calcular cuantiles")
+        if any(not 0 <= q <= 1 for q in qs):
+            raise ValueError("Los cuantiles deben estar entre 0 y 1")
+        ponderados = self._ponderados()
+        total = sum(peso for _, peso in ponderados)
+        resultados = []
+        for q in qs:
+            if q == 0:
+                resultados.append(self.minimo)
+                continue
+            if q == 1:
+                resultados.append(self.maximo)
+                continue
+            objetivo = q * total
+            acumulado = 0
+            for valor, peso in ponderados:
+                acumulado += peso
+                if acumulado >= objetivo:
+                    break
+            resultados.append(valor)
+        return resultados
+
+    def cuantil(self, q):
+        """Estima un cuantil (0.5 = mediana)."""
+        return self.cuantiles([q])[0]
+
+    def percentiles(self, ps=(5, 50, 95)):
+        """
+        Estima percentiles.
+
+        Args:
+            ps (iterable): Percentiles entre 0 y 100
+
+        Returns:
+            dict: Temperatura estimada de cada percentil
+        """
+        ps = list(ps)
+        return dict(zip(ps, self.cuantiles(p / 100 for p in ps)))
+
+    @property
+    def mediana(self):
+        """Mediana estimada."""
+        return self.cuantil(0.5)
+
+    @property
+    def error_rango(self):
+        """Error de rango aproximado con ~99 % de confianza (fracción de 0 a 1)."""
+        return 2.296 / self.k ** 0.9723
+
+    def __len__(self):
+        """Número de elementos guardados en el bosquejo (no el número de temperaturas)."""
+        return self._tam
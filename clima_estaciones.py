@@ -0,0 +1,239 @@
+"""
+Procesamiento de múltiples estaciones meteorológicas en paralelo.
+
+Cada estación tiene su propio historial de temperaturas diarias. Las estaciones
+se reparten en lotes entre los procesos de un pool; cada proceso resume sus
+estaciones con la lógica de SemanaClima y devuelve estadísticas parciales
+(conteo, suma, media y M2) que luego se combinan en el proceso principal.
+"""
+
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from POO import SemanaClima
+
+
+# Resumen de una estación: estadísticas de todo su historial más el promedio
+# y la clasificación de cada semana completa o parcial
+ResumenEstacion = namedtuple("ResumenEstacion", ["estacion", "estadisticas", "promedios_semanales", "clasificaciones"])
+
+
+class EstadisticasParciales:
+    """
+    Estadísticas combinables de una serie de temperaturas.
+
+    Dos instancias calculadas sobre conjuntos disjuntos se combinan con la
+    fórmula de Chan et al., que da la misma media y M2 que si todos los
+    valores se hubieran procesado juntos.
+
+    Atributos:
+        conteo (int): Número de temperaturas registradas
+        suma (float): Suma de las temperaturas
+        media (float): Media de las temperaturas
+        m2 (float): Suma de cuadrados de las desviaciones respecto a la media
+        minimo (float): Temperatura mínima, o None si no hay datos
+        maximo (float): Temperatura máxima, o None si no hay datos
+    """
+
+    def __init__(self):
+        """Constructor de unas estadísticas vacías."""
+        self.conteo = 0
+        self.suma = 0.0
+        self.media = 0.0
+        self.m2 = 0.0
+        self.minimo = None
+        self.maximo = None
+
+    @classmethod
+    def desde_valores(cls, valores):
+        """
+        Calcula las estadísticas de una serie, ignorando los días sin registro.
+
+        Args:
+            valores (iterable): Temperaturas (None para días sin registro)
+
+        Returns:
+            EstadisticasParciales: Estadísticas de la serie
+        """
+        estadisticas = cls()
+        datos = [valor for valor in valores if valor is not None]
+        if not datos:
+            return estadisticas
+        estadisticas.conteo = len(datos)
+        estadisticas.suma = sum(datos)
+        estadisticas.media = estadisticas.suma / estadisticas.conteo
+        media = estadisticas.media
+        estadisticas.m2 = sum((valor - media) * (valor - media) for valor in datos)
+        estadisticas.minimo = min(datos)
+        estadisticas.maximo = max(datos)
+        return estadisticas
+
+    def combinar(self, otra):
+        """
+        Combina estas estadísticas con las de otro conjunto disjunto.
+
+        Args:
+            otra (EstadisticasParciales): Estadísticas a incorporar
+
+        Returns:
+            EstadisticasParciales: Nuevas estadísticas combinadas
+        """
+        if not otra.conteo:
+            return self._copia()
+        if not self.conteo:
+            return otra._copia()
+        combinada = EstadisticasParciales()
+        conteo = self.conteo + otra.conteo
+        delta = otra.media - self.media
+        combinada.conteo = conteo
+        combinada.suma = self.suma + otra.suma
+        combinada.media = self.media + delta * otra.conteo / conteo
+        combinada.m2 = self.m2 + otra.m2 + delta * delta * self.conteo * otra.conteo / conteo
+        combinada.minimo = min(self.minimo, otra.minimo)
+        combinada.maximo = max(self.maximo, otra.maximo)
+        return combinada
+
+    def _copia(self):
+        """Devuelve una copia independiente de las estadísticas."""
+        copia = EstadisticasParciales()
+        copia.__dict__.update(self.__dict__)
+        return copia
+
+    @property
+    def promedio(self):
+        """Promedio redondeado a 2 decimales, como SemanaClima.calcular_promedio."""
+        return round(self.media, 2) if self.conteo else 0.0
+
+    @property
+    def varianza(self):
+        """Varianza poblacional de las temperaturas."""
+        return self.m2 / self.conteo if self.conteo else 0.0
+
+    def __eq__(self, otra):
+        """Dos estadísticas son iguales si todos sus campos coinciden."""
+        if not isinstance(otra, EstadisticasParciales):
+            return NotImplemented
+        return self.__dict__ == otra.__dict__
+
+    def __repr__(self):
+        """Representación compacta para depuración."""
+        return (f"EstadisticasParciales(conteo={self.conteo}, media={self.media}, "
+                f"m2={self.m2}, minimo={self.minimo}, maximo={self.maximo})")
+
+
+def resumir_estacion(estacion, temperaturas):
+    """
+    Resume el historial de una estación semana a semana con SemanaClima.
+
+    Args:
+        estacion (hashable): Identificador de la estación
+        temperaturas (list): Temperaturas diarias (None para días sin registro)
+
+    Returns:
+        ResumenEstacion: Resumen de la estación
+    """
+    promedios = []
+    clasificaciones = []
+    for inicio in range(0, len(temperaturas), 7):
+        semana = SemanaClima.desde_temperaturas(temperaturas[inicio:inicio + 7])
+        try:
+            promedio = semana.calcular_promedio()
+        except ValueError:
+            # Semana sin ninguna temperatura registrada
+            promedio = None
+        promedios.append(promedio)
+        clasificaciones.append(None if promedio is None else semana.clasificar_clima(promedio))
+    estadisticas = EstadisticasParciales.desde_valores(temperaturas)
+    return ResumenEstacion(estacion, estadisticas, promedios, clasificaciones)
+
+
+def _resumir_lote(lote):
+    """Resume un lote de estaciones dentro de un proceso trabajador."""
+    return [resumir_estacion(estacion, temperaturas) for estacion, temperaturas in lote]
+
+
+class GestorEstaciones:
+    """
+    Gestiona los historiales de muchas estaciones meteorológicas.
+
+    Atributos:
+        _historiales (dict): Temperaturas diarias de cada estación, en orden
+            de inserción
+    """
+
+    def __init__(self):
+        """Constructor del GestorEstaciones."""
+        self._historiales = {}
+
+    def agregar_estacion(self, estacion, temperaturas):
+        """
+        Registra (o reemplaza) el historial de una estación.
+
+        Args:
+            estacion (hashable): Identificador de la estación
+            temperaturas (iterable): Temperaturas diarias (None si no hay registro)
+        """
+        self._historiales[estacion] = list(temperaturas)
+
+    def __len__(self):
+        """Número de estaciones registradas."""
+        return len(self._historiales)
+
+    def _lotes(self, tam_lote):
+        """Divide las estaciones en lotes consecutivos de tam_lote elementos."""
+        elementos = list(self._historiales.items())
+        return [elementos[i:i + tam_lote] for i in range(0, len(elementos), tam_lote)]
+
+    def procesar_serial(self):
+        """
+        Resume todas las estaciones en el proceso actual.
+
+        Returns:
+            dict: ResumenEstacion de cada estación
+        """
+        return {estacion: resumir_estacion(estacion, temperaturas)
+                for estacion, temperaturas in self._historiales.items()}
+
+    def procesar(self, procesos=None, tam_lote=None):
+        """
+        Resume todas las estaciones repartiéndolas entre un pool de procesos.
+
+        Cada estación se resume completa dentro de un único proceso, por lo que
+        el resultado es idéntico al de procesar_serial.
+
+        Args:
+            procesos (int, optional): Número de procesos (por defecto, núcleos)
+            tam_lote (int, optional): Estaciones por tarea enviada al pool
+
+        Returns:
+            dict: ResumenEstacion de cada estación
+        """
+        if not self._historiales:
+            return {}
+        procesos = procesos or os.cpu_count() or 1
+        if tam_lote is None:
+            # Unos cuatro lotes por proceso equilibran carga y coste de envío
+            tam_lote = max(1, -(-len(self._historiales) // (procesos * 4)))
+        resumenes = {}
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            for parcial in pool.map(_resumir_lote, self._lotes(tam_lote)):
+                for resumen in parcial:
+                    resumenes[resumen.estacion] = resumen
+        return resumenes
+
+    @staticmethod
+    def estadisticas_globales(resumenes):
+        """
+        Combina las estadísticas de todas las estaciones en un único resultado.
+
+        Args:
+            resumenes (dict): Resultado de procesar o procesar_serial
+
+        Returns:
+            EstadisticasParciales: Estadísticas de todas las temperaturas
+        """
+        total = EstadisticasParciales()
+        for resumen in resumenes.values():
+            total = total.combinar(resumen.estadisticas)
+        return total
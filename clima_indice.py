@@ -0,0 +1,215 @@
+"""
+Índice de resúmenes para consultas de rango sobre series de temperaturas.
+
+Combina sumas prefijas (promedio de cualquier rango en O(1)) con un árbol de
+segmentos cuyos nodos guardan suma, conteo, mínimo y máximo de su tramo
+(mínimo y máximo de cualquier rango en O(log n)). Cada nivel del árbol es una
+resolución distinta de la serie: días, pares de días, cuartetos, etc.
+"""
+
+
+_INF = float("inf")
+_NAN = float("nan")
+
+
+class IndiceTemperaturas:
+    """
+    Índice incremental sobre una serie de temperaturas diarias.
+
+    Los rangos se expresan como índices semiabiertos [inicio, fin) desde el
+    primer día de la serie; los métodos *_fechas aceptan fechas inclusivas.
+
+    Atributos:
+        fecha_inicio (date): Fecha del primer día (None si no se indicó)
+    """
+
+    def __init__(self, temperaturas=(), fecha_inicio=None):
+        """
+        Constructor del índice.
+
+        Args:
+            temperaturas (iterable): Temperaturas iniciales (None si no hay registro)
+            fecha_inicio (date, optional): Fecha del primer día de la serie
+        """
+        self.fecha_inicio = fecha_inicio
+        self._n = 0
+        self._prefijo_suma = [0.0]
+        self._prefijo_conteo = [0]
+        self._capacidad = 1
+        self._crear_arbol()
+        self.extender(temperaturas)
+
+    @classmethod
+    def desde_semanas(cls, semanas, fecha_inicio=None):
+        """
+        Construye el índice con los días de varias SemanaClima consecutivas.
+
+        Args:
+            semanas (iterable): Objetos SemanaClima en orden cronológico
+            fecha_inicio (date, optional): Fecha del primer día
+
+        Returns:
+            IndiceTemperaturas: Índice de todos los días
+        """
+        return cls((dia.temperatura for semana in semanas for dia in semana._dias), fecha_inicio)
+
+    def _crear_arbol(self):
+        """Reserva el árbol para la capacidad actual y recoloca las hojas existentes."""
+        tam = 2 * self._capacidad
+        suma, conteo = [0.0] * tam, [0] * tam
+        minimos, maximos = [_INF] * tam, [-_INF] * tam
+        if self._n:
+            # Las hojas del árbol anterior ocupan [capacidad / 2, capacidad / 2 + n)
+            anterior = self._capacidad // 2
+            base = self._capacidad
+            suma[base:base + self._n] = self._suma[anterior:anterior + self._n]
+            conteo[base:base + self._n] = self._conteo[anterior:anterior + self._n]
+            minimos[base:base + self._n] = self._min[anterior:anterior + self._n]
+            maximos[base:base + self._n] = self._max[anterior:anterior + self._n]
+        self._suma, self._conteo, self._min, self._max = suma, conteo, minimos, maximos
+        for nodo in range(self._capacidad - 1, 0, -1):
+            self._combinar_nodo(nodo)
+
+    def _combinar_nodo(self, nodo):
+        """Recalcula un nodo interno a partir de sus dos hijos."""
+        izq, der = 2 * nodo, 2 * nodo + 1
+        self._suma[nodo] = self._suma[izq] + self._suma[der]
+        self._conteo[nodo] = self._conteo[izq] + self._conteo[der]
+        self._min[nodo] = min(self._min[izq], self._min[der])
+        self._max[nodo] = max(self._max[izq], self._max[der])
+
+    def agregar(self, temperatura):
+        """
+        Agrega el día siguiente de la serie en O(log n) amortizado.
+
+        Args:
+            temperatura (float): Temperatura del día, o None (o NaN, como en
+                ArchivoClima y SerieCalendario) si no hay registro
+
+        Raises:
+            ValueError: Si la temperatura es infinita (arruinaría las sumas prefijas)
+        """
+        valor = _NAN if temperatura is None else float(temperatura)
+        registrado = valor == valor
+        if not registrado:
+            valor = 0.0
+        elif valor in (_INF, -_INF):
+            raise ValueError("La temperatura debe ser un número finito")
+        if self._n == self._capacidad:
+            self._capacidad *= 2
+            self._crear_arbol()
+        self._prefijo_suma.append(self._prefijo_suma[-1] + valor)
+        self._prefijo_conteo.append(self._prefijo_conteo[-1] + registrado)
+        nodo = self._capacidad + self._n
+        self._n += 1
+        if not registrado:
+            return
+        self._suma[nodo] = valor
+        self._conteo[nodo] = 1
+        self._min[nodo] = valor
+        self._max[nodo] = valor
+        nodo //= 2
+        while nodo:
+            self._combinar_nodo(nodo)
+            nodo //= 2
+
+    def extender(self, temperaturas):
+        """Agrega varios días consecutivos al final de la serie."""
+        for temperatura in temperaturas:
+            self.agregar(temperatura)
+
+    def __len__(self):
+        """Número de días indexados."""
+        return self._n
+
+    def _validar_rango(self, inicio, fin):
+        """Comprueba que [inicio, fin) esté dentro de la serie."""
+        if not 0 <= inicio <= fin <= self._n:
+            raise IndexError("El rango está fuera de la serie indexada")
+
+    def conteo(self, inicio, fin):
+        """Número de días con temperatura registrada en [inicio, fin), en O(1)."""
+        self._validar_rango(inicio, fin)
+        return self._prefijo_conteo[fin] - self._prefijo_conteo[inicio]
+
+    def suma(self, inicio, fin):
+        """Suma de las temperaturas registradas en [inicio, fin), en O(1)."""
+        self._validar_rango(inicio, fin)
+        return self._prefijo_suma[fin] - self._prefijo_suma[inicio]
+
+    def promedio(self, inicio, fin):
+        """
+        Promedio de las temperaturas registradas en [inicio, fin), en O(1).
+
+        Returns:
+            float: Promedio redondeado a 2 decimales
+
+        Raises:
+            ValueError: Si no hay temperaturas registradas en el rango
+        """
+        conteo = self.conteo(inicio, fin)
+        if not conteo:
+            raise ValueError("No hay temperaturas registradas en el rango")
+        return round(self.suma(inicio, fin) / conteo, 2)
+
+    def _consultar(self, inicio, fin):
+        """Recorre el árbol y devuelve (mínimo, máximo) de [inicio, fin) en O(log n)."""
+        self._validar_rango(inicio, fin)
+        minimo, maximo = _INF, -_INF
+        izq, der = inicio + self._capacidad, fin + self._capacidad
+        while izq < der:
+            if izq & 1:
+                minimo = min(minimo, self._min[izq])
+                maximo = max(maximo, self._max[izq])
+                izq += 1
+            if der & 1:
+                der -= 1
+                minimo = min(minimo, self._min[der])
+                maximo = max(maximo, self._max[der])
+            izq //= 2
+            der //= 2
+        if minimo == _INF:
+            raise ValueError("No hay temperaturas registradas en el rango")
+        return minimo, maximo
+
+    def minimo(self, inicio, fin):
+        """Temperatura mínima registrada en [inicio, fin)."""
+        return self._consultar(inicio, fin)[0]
+
+    def maximo(self, inicio, fin):
+        """Temperatura máxima registrada en [inicio, fin)."""
+        return self._consultar(inicio, fin)[1]
+
+    def resumen(self, inicio, fin):
+        """
+        Resume el rango [inicio, fin) en una sola consulta.
+
+        Returns:
+            dict: Claves 'conteo', 'promedio', 'minimo' y 'maximo'
+
+        Raises:
+            ValueError: Si no hay temperaturas registradas en el rango
+        """
+        minimo, maximo = self._consultar(inicio, fin)
+        return {
+            'conteo': self.conteo(inicio, fin),
+            'promedio': self.promedio(inicio, fin),
+            'minimo': minimo,
+            'maximo': maximo
+        }
+
+    def rango_de_fechas(self, fecha_a, fecha_b):
+        """
+        Convierte dos fechas inclusivas en el rango de índices [inicio, fin).
+
+        Raises:
+            ValueError: Si el índice no tiene fecha de inicio
+        """
+        if self.fecha_inicio is None:
+            raise ValueError("El índice no tiene fecha de inicio")
+        base = self.fecha_inicio.toordinal()
+        return fecha_a.toordinal() - base, fecha_b.toordinal() - base + 1
+
+    def resumen_fechas(self, fecha_a, fecha_b):
+        """Resume el rango de fechas [fecha_a, fecha_b], ambas incluidas."""
+        return self.resumen(*self.rango_de_fechas(fecha_a, fecha_b))
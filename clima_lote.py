@@ -0,0 +1,184 @@
+"""
+Procesamiento por lotes, sin interacción, de muchas semanas de temperaturas.
+
+Lee semanas desde archivos o desde la entrada estándar (una semana por línea)
+y escribe el promedio y la clasificación de cada una en un formato para
+máquinas. Todo el flujo son generadores: la memoria no crece con el número de
+semanas y no hay recursión ni preguntas al usuario.
+
+Formato de entrada:
+    # Las líneas vacías y las que empiezan con '#' se ignoran
+    20.5, 21, 19.8, 22, 23.1, 24, 22.5
+    18 17 NA 19 20 21 19          <- NA o un campo vacío = día sin registro
+    estacion-7;12;13;14;15;16;17;18   <- con --con-id, el primer campo es el identificador
+
+Uso:
+    python clima_lote.py semanas.txt otra.txt > resultados.jsonl
+    cat semanas.csv | python clima_lote.py --formato csv
+    python clima_lote.py --con-id --formato tsv - < semanas.txt
+"""
+
+import argparse
+import csv
+import json
+import math
+import re
+import sys
+
+from clima_nucleo import calcular_promedio, clasificar_clima
+
+
+FORMATOS = ("jsonl", "csv", "tsv")
+_SEPARADORES = re.compile(r"[,;]")
+_FALTANTES = {"", "na", "nan", "-", "null", "none"}
+_COLUMNAS = ("origen", "linea", "id", "dias", "registrados", "promedio", "clasificacion", "errores")
+
+
+def leer_lineas(rutas):
+    """
+    Genera las líneas de los archivos indicados ("-" = entrada estándar).
+
+    Yields:
+        tuple: (origen, número de línea, texto)
+    """
+    for ruta in rutas or ["-"]:
+        if ruta == "-":
+            for numero, linea in enumerate(sys.stdin, 1):
+                yield "<stdin>", numero, linea
+        else:
+            with open(ruta, encoding="utf-8") as archivo:
+                for numero, linea in enumerate(archivo, 1):
+                    yield ruta, numero, linea
+
+
+def interpretar_semanas(lineas, con_id=False):
+    """
+    Convierte líneas de texto en semanas de temperaturas.
+
+    Args:
+        lineas (iterable): Tuplas (origen, número de línea, texto)
+        con_id (bool): Si el primer campo de cada línea es un identificador
+
+    Yields:
+        tuple: (origen, línea, identificador, temperaturas, índices no válidos)
+    """
+    for origen, numero, linea in lineas:
+        texto = linea.strip()
+        if not texto or texto.startswith("#"):
+            continue
+        if _SEPARADORES.search(texto):
+            # Cada coma o punto y coma separa un campo, así que dos seguidos
+            # dejan un campo vacío (día sin registro)
+            campos = [campo.strip() for campo in _SEPARADORES.split(texto)]
+        else:
+            campos = texto.split()
+        identificador = campos.pop(0) if con_id else None
+        temperaturas = []
+        errores = []
+        for indice, campo in enumerate(campos):
+            if campo.lower() in _FALTANTES:
+                temperaturas.append(None)
+                continue
+            try:
+                valor = float(campo)
+            except ValueError:
+                valor = None
+            if valor is None or not math.isfinite(valor):
+                # inf, 1e400, ... tampoco son temperaturas válidas
+                temperaturas.append(None)
+                errores.append(indice)
+            else:
+                temperaturas.append(valor)
+        yield origen, numero, identificador, temperaturas, errores
+
+
+def procesar_semanas(semanas):
+    """
+    Calcula el promedio y la clasificación de cada semana con el núcleo compartido.
+
+    Yields:
+        dict: Resultado de cada semana (promedio y clasificación None si no
+            tiene temperaturas registradas o si el promedio no es finito)
+    """
+    for origen, numero, identificador, temperaturas, errores in semanas:
+        registrados = len(temperaturas) - temperaturas.count(None)
+        promedio = calcular_promedio(temperaturas) if registrados else None
+        if promedio is not None and math.isfinite(promedio):
+            clasificacion = clasificar_clima(promedio)
+        else:
+            # La suma de valores enormes (p. ej. 1e308 + 1e308) desborda a inf
+            promedio = clasificacion = None
+        yield {
+            'origen': origen,
+            'linea': numero,
+            'id': identificador,
+            'dias': len(temperaturas),
+            'registrados': registrados,
+            'promedio': promedio,
+            'clasificacion': clasificacion,
+            'errores': errores
+        }
+
+
+def escribir_resultados(resultados, formato="jsonl", salida=None, tam_bloque=4096):
+    """
+    Escribe los resultados agrupando las líneas en bloques para reducir escrituras.
+
+    Args:
+        resultados (iterable): Diccionarios de procesar_semanas
+        formato (str): "jsonl", "csv" o "tsv"
+        salida (file, optional): Destino (por defecto, la salida estándar)
+        tam_bloque (int): Resultados por escritura
+
+    Returns:
+        int: Número de semanas escritas
+    """
+    salida = salida if salida is not None else sys.stdout
+    total = 0
+    if formato == "jsonl":
+        bloque = []
+        for resultado in resultados:
+            bloque.append(json.dumps(resultado, ensure_ascii=False, allow_nan=False))
+            if len(bloque) >= tam_bloque:
+                salida.write("\n".join(bloque) + "\n")
+                total += len(bloque)
+                bloque = []
+        if bloque:
+            salida.write("\n".join(bloque) + "\n")
+            total += len(bloque)
+    else:
+        escritor = csv.writer(salida, delimiter="," if formato == "csv" else "\t", lineterminator="\n")
+        escritor.writerow(_COLUMNAS)
+        for resultado in resultados:
+            fila = [resultado[columna] for columna in _COLUMNAS]
+            fila[-1] = " ".join(map(str, fila[-1]))
+            escritor.writerow(fila)
+            total += 1
+    salida.flush()
+    return total
+
+
+def main(argumentos=None):
+    """Punto de entrada del procesamiento por lotes."""
+    parser = argparse.ArgumentParser(description="Promedio y clasificación de muchas semanas sin interacción")
+    parser.add_argument("archivos", nargs="*", help="Archivos de entrada ('-' o ninguno = entrada estándar)")
+    parser.add_argument("--formato", choices=FORMATOS, default="jsonl", help="Formato de salida (por defecto jsonl)")
+    parser.add_argument("--con-id", action="store_true", help="El primer campo de cada línea es un identificador")
+    opciones = parser.parse_args(argumentos)
+
+    semanas = interpretar_semanas(leer_lineas(opciones.archivos), opciones.con_id)
+    try:
+        total = escribir_resultados(procesar_semanas(semanas), opciones.formato)
+    except BrokenPipeError:
+        # La salida se cerró antes de tiempo (p. ej. `| head`); no es un error
+        return 0
+    except OSError as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+    print(f"[INFO] {total} semanas procesadas.", file=sys.stderr)
+    return 0
+
+
+# Punto de entrada del programa
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+Núcleo de cálculo compartido por los programas de clima (POO y Programación Tradicional).
+
+Contiene el cálculo del promedio de temperaturas y la clasificación del clima
+por umbrales configurables, tanto para un solo promedio como para lotes
+completos de promedios. Ambos programas llaman a estas funciones, de modo que
+redondean y clasifican exactamente igual.
+"""
+
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+from functools import partial
+
+
+# Umbrales (°C) que separan las categorías de clima. Un promedio igual al
+# umbral pertenece a la categoría superior (p. ej. 10 es "Frío").
+UMBRALES_CLIMA = (10, 20, 25, 30)
+
+# Etiquetas de cada categoría, de la más fría a la más cálida
+ETIQUETAS_CLIMA = ("Muy frío", "Frío", "Templado", "Cálido", "Muy cálido")
+
+
+def calcular_promedio(temperaturas):
+    """
+    Calcula el promedio de una serie de temperaturas redondeado a 2 decimales.
+
+    Los valores None (días sin registro) se ignoran. Si la serie no trae
+    ningún None se promedia directamente, sin copiarla.
+
+    Args:
+        temperaturas (list): Temperaturas (None para días sin registro)
+
+    Returns:
+        float: Promedio redondeado a 2 decimales, o 0.0 si la serie está vacía
+
+    Raises:
+        ValueError: Si ningún valor de la serie está registrado
+    """
+    if not temperaturas:
+        return 0.0
+    if None in temperaturas:
+        temperaturas = [temperatura for temperatura in temperaturas if temperatura is not None]
+        if not temperaturas:
+            raise ValueError("No hay temperaturas registradas para calcular el promedio")
+    return round(sum(temperaturas) / len(temperaturas), 2)
+
+
+# Resultado de clasificar un lote de promedios
+ClasificacionLote = namedtuple("ClasificacionLote", ["codigos", "etiquetas", "conteos"])
+
+
+class ClasificadorClima:
+    """
+    Clasifica promedios de temperatura en categorías delimitadas por umbrales.
+
+    La clasificación es una búsqueda binaria sobre los umbrales, por lo que un
+    lote completo se etiqueta en una sola pasada y se devuelve como códigos
+    compactos (un byte por promedio) más la tabla de etiquetas.
+
+    Atributos:
+        umbrales (tuple): Umbrales ordenados de forma estrictamente creciente
+        etiquetas (tuple): Etiquetas de las categorías (una más que umbrales)
+    """
+
+    def __init__(self, umbrales=UMBRALES_CLIMA, etiquetas=ETIQUETAS_CLIMA):
+        """
+        Constructor del clasificador.
+
+        Args:
+            umbrales (iterable): Umbrales de separación entre categorías
+            etiquetas (iterable): Etiquetas de las categorías
+
+        Raises:
+            ValueError: Si los umbrales no son crecientes o las etiquetas no
+                coinciden con el número de categorías
+        """
+        umbrales = tuple(umbrales)
+        etiquetas = tuple(etiquetas)
+        if any(a >= b for a, b in zip(umbrales, umbrales[1:])):
+            raise ValueError("Los umbrales deben estar en orden estrictamente creciente")
+        if len(etiquetas) != len(umbrales) + 1:
+            raise ValueError("Debe haber exactamente una etiqueta más que umbrales")
+        if len(etiquetas) > 256:
+            raise ValueError("No se admiten más de 256 categorías")
+        self.umbrales = umbrales
+        self.etiquetas = etiquetas
+        self._codificar = partial(bisect_right, umbrales)
+
+    def codigo(self, promedio):
+        """
+        Devuelve el código de categoría de un promedio.
+
+        Args:
+            promedio (float): Promedio de temperatura
+
+        Returns:
+            int: Índice de la categoría dentro de `etiquetas`
+        """
+        return self._codificar(promedio)
+
+    def clasificar(self, promedio):
+        """
+        Devuelve la etiqueta de categoría de un promedio.
+
+        Args:
+            promedio (float): Promedio de temperatura
+
+        Returns:
+            str: Clasificación del clima
+        """
+        return self.etiquetas[self._codificar(promedio)]
+
+    def codificar(self, promedios):
+        """
+        Convierte un lote de promedios en códigos de categoría.
+
+        Args:
+            promedios (iterable): Promedios de temperatura
+
+        Returns:
+            array: Códigos de categoría (typecode 'B')
+        """
+        return array("B", map(self._codificar, promedios))
+
+    def clasificar_lote(self, promedios):
+        """
+        Clasifica un lote de promedios y cuenta cuántos caen en cada categoría.
+
+        Args:
+            promedios (iterable): Promedios de temperatura
+
+        Returns:
+            ClasificacionLote: Códigos, tabla de etiquetas e histograma de
+                conteos por categoría (en el mismo orden que las etiquetas)
+        """
+        codigos = self.codificar(promedios)
+        conteos = tuple(codigos.count(codigo) for codigo in range(len(self.etiquetas)))
+        return ClasificacionLote(codigos, self.etiquetas, conteos)
+
+
+# Clasificador con los umbrales por defecto, compartido por ambos programas
+CLASIFICADOR_CLIMA = ClasificadorClima()
+
+
+def clasificar_clima(promedio):
+    """
+    Clasifica el clima según el promedio de temperatura con los umbrales por defecto.
+
+    Args:
+        promedio (float): Promedio semanal de temperatura
+
+    Returns:
+        str: Clasificación del clima
+    """
+    return CLASIFICADOR_CLIMA.clasificar(promedio)
@@ -0,0 +1,164 @@
+"""
+Generación de reportes de clima por páginas con escrituras agrupadas.
+
+Los reportes se construyen de forma perezosa: cada página se renderiza en un
+único texto solo cuando se consume, y se escribe con una sola llamada. Un
+reporte de 10 000 estaciones con páginas de 1000 cuesta unas diez escrituras.
+
+Formatos disponibles:
+    texto  El mismo bloque que SemanaClima.mostrar_resumen, precedido por la estación
+    csv    Una fila por estación: estacion,dias,registrados,promedio,clasificacion
+    json   Un arreglo JSON con un objeto por estación
+"""
+
+import csv
+import io
+import json
+import math
+import sys
+from itertools import islice
+
+
+FORMATOS = ("texto", "csv", "json")
+_COLUMNAS_CSV = ("estacion", "dias", "registrados", "promedio", "clasificacion")
+
+
+def _datos_resumen(estacion, semana):
+    """Calcula los datos de una fila del reporte a partir de una SemanaClima."""
+    registrados = sum(1 for dia in semana._dias if dia.temperatura is not None)
+    # Sin días registrados no hay promedio (calcular_promedio daría 0.0 o un error)
+    promedio = semana.calcular_promedio() if registrados else None
+    clasificacion = semana.clasificar_clima(promedio) if registrados else None
+    return {
+        'estacion': estacion,
+        'dias': len(semana._dias),
+        'registrados': registrados,
+        'promedio': promedio,
+        'clasificacion': clasificacion
+    }
+
+
+class GeneradorReportes:
+    """
+    Renderiza resúmenes de muchas estaciones por páginas.
+
+    Atributos:
+        formato (str): "texto", "csv" o "json"
+        tam_pagina (int): Estaciones por página
+    """
+
+    def __init__(self, formato="texto", tam_pagina=1000):
+        """
+        Constructor del generador.
+
+        Raises:
+            ValueError: Si el formato o el tamaño de página no son válidos
+        """
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato no válido: {formato!r}. Use uno de {', '.join(FORMATOS)}")
+        if tam_pagina < 1:
+            raise ValueError("El tamaño de página debe ser al menos 1")
+        self.formato = formato
+        self.tam_pagina = tam_pagina
+
+    def _renderizar_texto(self, bloque):
+        """Renderiza una página en formato de texto."""
+        return "".join(f"\nEstación: {estacion}\n{semana.resumen_texto()}" for estacion, semana in bloque)
+
+    def _renderizar_csv(self, bloque, encabezado):
+        """Renderiza una página en formato CSV."""
+        buffer = io.StringIO()
+        escritor = csv.DictWriter(buffer, fieldnames=_COLUMNAS_CSV, lineterminator="\n")
+        if encabezado:
+            escritor.writeheader()
+        escritor.writerows(_datos_resumen(estacion, semana) for estacion, semana in bloque)
+        return buffer.getvalue()
+
+    def _renderizar_json(self, bloque, primera, ultima):
+        """
+        Renderiza una página como parte de un único arreglo JSON.
+
+        Un promedio no finito (NaN o infinito) se escribe como null, porque
+        NaN e Infinity no son JSON válido.
+        """
+        filas = []
+        for estacion, semana in bloque:
+            datos = _datos_resumen(estacion, semana)
+            if datos['promedio'] is not None and not math.isfinite(datos['promedio']):
+                datos['promedio'] = datos['clasificacion'] = None
+            filas.append(json.dumps(datos, ensure_ascii=False, allow_nan=False))
+        objetos = ",\n".join(filas)
+        inicio = "[\n" if primera else ",\n"
+        fin = "\n]\n" if ultima else ""
+        return inicio + objetos + fin
+
+    def paginas(self, semanas, max_paginas=None):
+        """
+        Genera las páginas del reporte a medida que se consumen.
+
+        Args:
+            semanas (iterable): Pares (estacion, SemanaClima); puede ser un
+                generador, solo se recorre lo necesario para cada página
+            max_paginas (int, optional): Detenerse tras este número de
+                páginas; en JSON la última cierra el arreglo
+
+        Yields:
+            str: Texto completo de cada página
+
+        Raises:
+            ValueError: Si max_paginas no es positivo
+        """
+        if max_paginas is not None and max_paginas < 1:
+            raise ValueError("El número máximo de páginas debe ser al menos 1")
+        iterador = iter(semanas)
+        bloque = list(islice(iterador, self.tam_pagina))
+        primera = True
+        if not bloque:
+            if self.formato == "json":
+                yield "[]\n"
+            elif self.formato == "csv":
+                yield self._renderizar_csv([], True)
+            return
+        numero = 1
+        while bloque:
+            # Se lee la página siguiente para saber si esta es la última (JSON)
+            if numero == max_paginas:
+                siguiente = []
+            else:
+                siguiente = list(islice(iterador, self.tam_pagina))
+            if self.formato == "texto":
+                yield self._renderizar_texto(bloque)
+            elif self.formato == "csv":
+                yield self._renderizar_csv(bloque, primera)
+            else:
+                yield self._renderizar_json(bloque, primera, not siguiente)
+            primera = False
+            bloque = siguiente
+            numero += 1
+
+    def escribir(self, semanas, salida=None, max_paginas=None):
+        """
+        Escribe el reporte con una llamada a write por página.
+
+        Args:
+            semanas (iterable): Pares (estacion, SemanaClima)
+            salida (file, optional): Destino (por defecto, la salida estándar)
+            max_paginas (int, optional): Detenerse tras este número de páginas
+
+        Returns:
+            int: Número de páginas escritas
+
+        Raises:
+            ValueError: Si max_paginas no es positivo
+        """
+        salida = salida if salida is not None else sys.stdout
+        escritas = 0
+        for pagina in self.paginas(semanas, max_paginas):
+            salida.write(pagina)
+            escritas += 1
+        salida.flush()
+        return escritas
+
+    def renderizar(self, semanas):
+        """Devuelve el reporte completo como un único texto."""
+        return "".join(self.paginas(semanas))
@@ -0,0 +1,314 @@
+"""
+Modo servicio (no interactivo) del GestorClima con una API asyncio.
+
+Expone las operaciones del menú como peticiones JSON, una por línea, a través
+de un socket TCP local, un socket Unix o la entrada estándar. Un único proceso
+atiende a muchos clientes concurrentes, y el resumen de cada semana se guarda
+en caché hasta que sus datos cambian.
+
+Peticiones (el campo "id" es opcional y se devuelve tal cual):
+    {"id": 1, "op": "enviar_semana", "semana": "s1", "temperaturas": [20, 21.5, null]}
+    {"id": 2, "op": "agregar_dia", "semana": "s1", "temperatura": 19}
+    {"id": 3, "op": "resumen", "semana": "s1"}
+    {"id": 4, "op": "clasificacion", "semana": "s1"}
+    {"id": 5, "op": "metricas"}
+
+Respuestas:
+    {"id": 3, "ok": true, "resultado": {...}}
+    {"id": 9, "ok": false, "error": "mensaje"}
+
+Si se omite "semana" se usa la semana actual del GestorClima.
+
+Uso:
+    python clima_servicio.py --puerto 8765
+    python clima_servicio.py --socket /tmp/clima.sock
+    python clima_servicio.py --stdin < peticiones.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import stat
+import sys
+
+from clima_nucleo import calcular_promedio
+from POO import DiaClima, GestorClima, SemanaClima
+
+
+SEMANA_ACTUAL = "actual"
+
+# Longitud máxima de una petición en los transportes asyncio (bytes)
+LIMITE_LINEA = 2 ** 20
+_RESPUESTA_LINEA_LARGA = json.dumps(
+    {"id": None, "ok": False, "error": f"La petición supera {LIMITE_LINEA} bytes"}, ensure_ascii=False) + "\n"
+
+
+def _resumir(semana):
+    """Calcula el resumen serializable de una semana."""
+    try:
+        promedio = semana.calcular_promedio()
+        clasificacion = semana.clasificar_clima(promedio)
+    except ValueError:
+        promedio = clasificacion = None
+    return {
+        "dias": [dia.mostrar_info() for dia in semana._dias],
+        "promedio": promedio,
+        "clasificacion": clasificacion
+    }
+
+
+def _comprobar_finitas(temperaturas):
+    """
+    Comprueba que las temperaturas registradas y su promedio sean finitos.
+
+    Se llama antes de guardar una semana, para que un valor como Infinity o
+    NaN no la deje inservible para los resúmenes posteriores.
+
+    Args:
+        temperaturas (list): Temperaturas (None para días sin registro)
+
+    Raises:
+        ValueError: Si alguna temperatura o el promedio no es finito
+    """
+    registradas = [temperatura for temperatura in temperaturas if temperatura is not None]
+    if not all(map(math.isfinite, registradas)):
+        raise ValueError("Las temperaturas deben ser números finitos")
+    if registradas and not math.isfinite(calcular_promedio(registradas)):
+        raise ValueError("El promedio de las temperaturas no es un número finito")
+
+
+class ServicioClima:
+    """
+    Atiende peticiones JSON sobre las semanas registradas en un GestorClima.
+
+    Atributos:
+        gestor (GestorClima): Gestor cuya semana_actual es la semana por defecto
+        _semanas (dict): Semanas adicionales por identificador
+    """
+
+    def __init__(self, gestor=None):
+        """
+        Constructor del servicio.
+
+        Args:
+            gestor (GestorClima, optional): Gestor a exponer (se crea uno si no se indica)
+        """
+        self.gestor = gestor if gestor is not None else GestorClima()
+        self._semanas = {}
+        self._operaciones = {
+            "enviar_semana": self._enviar_semana,
+            "agregar_dia": self._agregar_dia,
+            "resumen": self._resumen,
+            "clasificacion": self._clasificacion,
+            "metricas": self._metricas,
+        }
+
+    # Acceso a las semanas
+    def _obtener_semana(self, nombre):
+        """Devuelve la semana indicada o lanza KeyError si no existe."""
+        if nombre == SEMANA_ACTUAL:
+            semana = self.gestor.semana_actual
+        else:
+            semana = self._semanas.get(nombre)
+        if semana is None:
+            raise KeyError(f"No existe la semana '{nombre}'")
+        return semana
+
+    def _guardar_semana(self, nombre, semana):
+        """Registra una semana con el identificador indicado."""
+        if nombre == SEMANA_ACTUAL:
+            self.gestor.semana_actual = semana
+        else:
+            self._semanas[nombre] = semana
+
+    def resumen_semana(self, nombre=SEMANA_ACTUAL):
+        """
+        Devuelve el resumen de una semana desde la caché del gestor, que se
+        invalida sola cuando la semana cambia.
+
+        Args:
+            nombre (str): Identificador de la semana
+
+        Returns:
+            dict: Días, promedio y clasificación de la semana
+
+        Raises:
+            KeyError: Si la semana no existe
+        """
+        resumen = self.gestor.cache.obtener(self._obtener_semana(nombre), _resumir)
+        return dict(resumen, semana=nombre)
+
+    def metricas_cache(self):
+        """Métricas de aciertos de la caché de resúmenes."""
+        return self.gestor.cache.metricas()
+
+    # Operaciones
+    def _enviar_semana(self, peticion, nombre):
+        """Reemplaza una semana completa con las temperaturas recibidas."""
+        temperaturas = peticion.get("temperaturas")
+        if not isinstance(temperaturas, list):
+            raise ValueError("'temperaturas' debe ser una lista")
+        semana = SemanaClima()
+        for numero_dia, valor in enumerate(temperaturas, 1):
+            dia = DiaClima(numero_dia)
+            if valor is not None:
+                dia.temperatura = valor  # Usa el setter con validación
+            semana.agregar_dia(dia)
+        _comprobar_finitas([dia.temperatura for dia in semana._dias])
+        self._guardar_semana(nombre, semana)
+        return self.resumen_semana(nombre)
+
+    def _agregar_dia(self, peticion, nombre):
+        """Agrega el día siguiente a una semana existente."""
+        semana = self._obtener_semana(nombre)
+        dia = DiaClima(len(semana._dias) + 1)
+        if peticion.get("temperatura") is not None:
+            dia.temperatura = peticion["temperatura"]
+        _comprobar_finitas([dia.temperatura for dia in semana._dias] + [dia.temperatura])
+        semana.agregar_dia(dia)
+        return self.resumen_semana(nombre)
+
+    def _resumen(self, peticion, nombre):
+        """Devuelve el resumen completo de una semana."""
+        return self.resumen_semana(nombre)
+
+    def _clasificacion(self, peticion, nombre):
+        """Devuelve solo el promedio y la clasificación de una semana."""
+        resumen = self.resumen_semana(nombre)
+        return {"semana": nombre, "promedio": resumen["promedio"],
+                "clasificacion": resumen["clasificacion"]}
+
+    def _metricas(self, peticion, nombre):
+        """Devuelve las métricas de la caché de resúmenes."""
+        return self.metricas_cache()
+
+    def atender(self, linea):
+        """
+        Procesa una línea de petición JSON y devuelve la línea de respuesta.
+
+        Args:
+            linea (str | bytes): Petición JSON
+
+        Returns:
+            str: Respuesta JSON terminada en salto de línea
+        """
+        identificador = None
+        try:
+            peticion = json.loads(linea)
+            if not isinstance(peticion, dict):
+                raise ValueError("La petición debe ser un objeto JSON")
+            identificador = peticion.get("id")
+            operacion = self._operaciones.get(peticion.get("op"))
+            if operacion is None:
+                raise ValueError(f"Operación no válida: {peticion.get('op')!r}")
+            resultado = operacion(peticion, str(peticion.get("semana", SEMANA_ACTUAL)))
+            respuesta = {"id": identificador, "ok": True, "resultado": resultado}
+        except KeyError as e:
+            respuesta = {"id": identificador, "ok": False, "error": e.args[0]}
+        except RecursionError:
+            # json.loads con anidamiento excesivo ("[[[[...")
+            respuesta = {"id": identificador, "ok": False, "error": "La petición está anidada demasiado"}
+        except (ValueError, TypeError) as e:
+            respuesta = {"id": identificador, "ok": False, "error": str(e)}
+        try:
+            # allow_nan=False: NaN e Infinity no son JSON válido para los clientes
+            return json.dumps(respuesta, ensure_ascii=False, allow_nan=False) + "\n"
+        except ValueError:
+            error = "La respuesta contiene valores no finitos (NaN o infinito)"
+            try:
+                return json.dumps({"id": identificador, "ok": False, "error": error},
+                                  ensure_ascii=False, allow_nan=False) + "\n"
+            except ValueError:
+                # El propio identificador no es finito
+                return json.dumps({"id": None, "ok": False, "error": error}, ensure_ascii=False) + "\n"
+
+    # Transporte
+    async def _atender_flujo(self, lector, escritor):
+        """Atiende las peticiones de un cliente hasta que cierre la conexión."""
+        try:
+            while True:
+                try:
+                    linea = await lector.readline()
+                except ValueError:
+                    # Línea más larga que el límite: asyncio la descarta
+                    escritor.write(_RESPUESTA_LINEA_LARGA.encode("utf-8"))
+                    await escritor.drain()
+                    continue
+                if not linea:
+                    break
+                if not linea.strip():
+                    continue
+                escritor.write(self.atender(linea).encode("utf-8"))
+                await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    async def servir_tcp(self, host="127.0.0.1", puerto=8765):
+        """Atiende clientes concurrentes en un socket TCP local."""
+        servidor = await asyncio.start_server(self._atender_flujo, host, puerto, limit=LIMITE_LINEA)
+        async with servidor:
+            await servidor.serve_forever()
+
+    async def servir_unix(self, ruta):
+        """Atiende clientes concurrentes en un socket Unix."""
+        servidor = await asyncio.start_unix_server(self._atender_flujo, ruta, limit=LIMITE_LINEA)
+        async with servidor:
+            await servidor.serve_forever()
+
+    async def servir_stdin(self):
+        """Atiende las peticiones de la entrada estándar y responde por la salida estándar."""
+        bucle = asyncio.get_running_loop()
+        if stat.S_ISREG(os.fstat(sys.stdin.fileno()).st_mode):
+            # El transporte de tuberías no admite archivos regulares
+            # (--stdin < peticiones.jsonl): se leen en un hilo aparte
+            def leer():
+                return bucle.run_in_executor(None, sys.stdin.buffer.readline)
+        else:
+            lector = asyncio.StreamReader(limit=LIMITE_LINEA)
+            await bucle.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(lector), sys.stdin)
+            leer = lector.readline
+        while True:
+            try:
+                linea = await leer()
+            except ValueError:
+                # Línea más larga que el límite: asyncio la descarta
+                sys.stdout.write(_RESPUESTA_LINEA_LARGA)
+                sys.stdout.flush()
+                continue
+            if not linea:
+                break
+            if linea.strip():
+                sys.stdout.write(self.atender(linea))
+                sys.stdout.flush()
+
+
+def main(argumentos=None):
+    """Punto de entrada del modo servicio."""
+    parser = argparse.ArgumentParser(description="Servicio JSON-lines del GestorClima")
+    grupo = parser.add_mutually_exclusive_group()
+    grupo.add_argument("--puerto", type=int, default=8765, help="Puerto TCP local (por defecto 8765)")
+    grupo.add_argument("--socket", help="Ruta de un socket Unix")
+    grupo.add_argument("--stdin", action="store_true", help="Leer peticiones de la entrada estándar")
+    parser.add_argument("--host", default="127.0.0.1", help="Dirección TCP (por defecto 127.0.0.1)")
+    opciones = parser.parse_args(argumentos)
+
+    servicio = ServicioClima()
+    if opciones.stdin:
+        corrutina = servicio.servir_stdin()
+    elif opciones.socket:
+        corrutina = servicio.servir_unix(opciones.socket)
+    else:
+        corrutina = servicio.servir_tcp(opciones.host, opciones.puerto)
+    try:
+        asyncio.run(corrutina)
+    except KeyboardInterrupt:
+        print("\n[INFO] Servicio detenido por el usuario.", file=sys.stderr)
+
+
+# Punto de entrada del programa
+if __name__ == "__main__":
+    main()
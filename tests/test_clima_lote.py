@@ -0,0 +1,49 @@
+"""Pruebas de la interpretación de semanas del procesamiento por lotes."""
+
+import unittest
+
+from clima_lote import interpretar_semanas, procesar_semanas
+
+
+def interpretar(texto, con_id=False):
+    """Interpreta una sola línea y devuelve (identificador, temperaturas, errores)."""
+    (_, _, identificador, temperaturas, errores), = interpretar_semanas([("prueba", 1, texto)], con_id)
+    return identificador, temperaturas, errores
+
+
+class PruebasInterpretarSemanas(unittest.TestCase):
+    """Separadores, campos vacíos y valores faltantes."""
+
+    def test_campo_vacio_es_dia_sin_registro(self):
+        _, temperaturas, errores = interpretar("20,,22,23,24,25,26\n")
+        self.assertEqual(temperaturas, [20, None, 22, 23, 24, 25, 26])
+        self.assertEqual(errores, [])
+
+    def test_comas_con_espacios(self):
+        _, temperaturas, _ = interpretar("20.5, 21 , ,19.8\n")
+        self.assertEqual(temperaturas, [20.5, 21, None, 19.8])
+
+    def test_espacios_sin_comas(self):
+        _, temperaturas, _ = interpretar("18 17  NA\t19\n")
+        self.assertEqual(temperaturas, [18, 17, None, 19])
+
+    def test_identificador_y_punto_y_coma(self):
+        identificador, temperaturas, errores = interpretar("estacion-7;12;;x\n", con_id=True)
+        self.assertEqual(identificador, "estacion-7")
+        self.assertEqual(temperaturas, [12, None, None])
+        self.assertEqual(errores, [2])
+
+    def test_valores_no_finitos_no_son_validos(self):
+        _, temperaturas, errores = interpretar("20, inf, 1e400, -Infinity, nan\n")
+        self.assertEqual(temperaturas, [20, None, None, None, None])
+        self.assertEqual(errores, [1, 2, 3])
+
+    def test_promedio_desbordado_es_none(self):
+        resultado, = procesar_semanas(interpretar_semanas([("prueba", 1, "1e308, 1e308\n")]))
+        self.assertEqual(resultado["registrados"], 2)
+        self.assertIsNone(resultado["promedio"])
+        self.assertIsNone(resultado["clasificacion"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Paridad del núcleo de cálculo del clima con las implementaciones originales.
+
+Ambos programas (Programación Tradicional y POO) deben redondear
+(round(x, 2)) y clasificar exactamente igual que antes de compartir el
+núcleo, incluso en los umbrales y en promedios que caen en la mitad de un
+centésimo, donde un cambio en el orden de la suma o en el redondeo se notaría.
+"""
+
+import random
+import unittest
+
+from POO import DiaClima, SemanaClima
+from ProgramacionTradicional import calcular_promedio_semanal
+from clima_nucleo import clasificar_clima
+
+
+def _promedio_original(temperaturas):
+    """Promedio tal como lo calculaban ambos programas antes del núcleo."""
+    registradas = [t for t in temperaturas if t is not None]
+    return round(sum(registradas) / len(registradas), 2)
+
+
+def _clasificacion_original(promedio):
+    """Cadena if/elif que duplicaban ambos programas antes del núcleo."""
+    if promedio < 10:
+        return "Muy frío"
+    elif promedio < 20:
+        return "Frío"
+    elif promedio < 25:
+        return "Templado"
+    elif promedio < 30:
+        return "Cálido"
+    else:
+        return "Muy cálido"
+
+
+def _semana_desde(temperaturas):
+    """Construye una SemanaClima pasando cada temperatura por el setter."""
+    semana = SemanaClima()
+    for numero_dia, temperatura in enumerate(temperaturas, 1):
+        dia = DiaClima(numero_dia)
+        if temperatura is not None:
+            dia.temperatura = temperatura
+        semana.agregar_dia(dia)
+    return semana
+
+
+def _series(casos=20_000, semilla=2024):
+    """Series de los umbrales y casos de redondeo más series aleatorias."""
+    generador = random.Random(semilla)
+    series = [[10.0] * 7, [20.0] * 7, [25.0] * 7, [30.0] * 7, [9.995] * 7,
+              [0.125, 0.13], [1e-3, -1e-3, 2.675], [24.994999] * 3, [-40.0, 55.5]]
+    for _ in range(casos):
+        longitud = generador.randint(1, 14)
+        series.append([round(generador.uniform(-20, 45), generador.randint(0, 4)) for _ in range(longitud)])
+    return series
+
+
+class PruebasParidadNucleo(unittest.TestCase):
+    """Ambos caminos coinciden con las implementaciones originales."""
+
+    def test_promedio_y_clasificacion(self):
+        for serie in _series():
+            esperado = _promedio_original(serie)
+            semana = _semana_desde(serie)
+            self.assertEqual(calcular_promedio_semanal(serie), esperado, f"Tradicional difiere en {serie}")
+            self.assertEqual(semana.calcular_promedio(), esperado, f"POO difiere en {serie}")
+            clasificacion = _clasificacion_original(esperado)
+            self.assertEqual(clasificar_clima(esperado), clasificacion)
+            self.assertEqual(semana.clasificar_clima(esperado), clasificacion)
+            # Con días sin registro, POO ignora los None igual que antes
+            self.assertEqual(_semana_desde(serie + [None]).calcular_promedio(), esperado)
+
+    def test_umbrales(self):
+        for umbral in (-1e9, 9.99, 10, 10.01, 19.99, 20, 24.99, 25, 29.99, 30, 1e9):
+            self.assertEqual(clasificar_clima(umbral), _clasificacion_original(umbral))
+
+    def test_serie_vacia(self):
+        self.assertEqual(calcular_promedio_semanal([]), 0.0)
+        self.assertEqual(SemanaClima().calcular_promedio(), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
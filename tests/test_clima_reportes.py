@@ -0,0 +1,35 @@
+"""Pruebas del reporte JSON por páginas."""
+
+import io
+import json
+import unittest
+
+from clima_reportes import GeneradorReportes
+from POO import SemanaClima
+
+
+def semanas(cantidad):
+    """Pares (estación, semana) con una temperatura distinta por estación."""
+    return [(f"e{i}", SemanaClima.desde_temperaturas([20 + i, None])) for i in range(cantidad)]
+
+
+class PruebasReporteJson(unittest.TestCase):
+    """El reporte JSON es siempre un arreglo válido."""
+
+    def escribir(self, datos, max_paginas=None):
+        salida = io.StringIO()
+        GeneradorReportes("json", tam_pagina=2).escribir(iter(datos), salida, max_paginas)
+        return json.loads(salida.getvalue(), parse_constant=self.fail)
+
+    def test_max_paginas_cierra_el_arreglo(self):
+        reporte = self.escribir(semanas(5), max_paginas=1)
+        self.assertEqual([fila["estacion"] for fila in reporte], ["e0", "e1"])
+
+    def test_promedio_no_finito_es_null(self):
+        reporte = self.escribir([("e0", SemanaClima.desde_temperaturas([float("inf")]))])
+        self.assertIsNone(reporte[0]["promedio"])
+        self.assertIsNone(reporte[0]["clasificacion"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""Pruebas del modo servicio del GestorClima."""
+
+import json
+import unittest
+
+from clima_servicio import ServicioClima
+
+
+class PruebasServicioClima(unittest.TestCase):
+    """Respuestas de ServicioClima.atender ante peticiones válidas y no válidas."""
+
+    def setUp(self):
+        self.servicio = ServicioClima()
+
+    def atender(self, peticion):
+        """Envía una petición (dict o texto) y devuelve la respuesta decodificada."""
+        linea = peticion if isinstance(peticion, str) else json.dumps(peticion)
+        respuesta = self.servicio.atender(linea)
+        self.assertTrue(respuesta.endswith("\n"))
+        return json.loads(respuesta)
+
+    def decodificar_estricto(self, respuesta):
+        """Decodifica una respuesta fallando si contiene NaN, Infinity o -Infinity."""
+        def rechazar(constante):
+            self.fail(f"La respuesta contiene {constante}: {respuesta!r}")
+        return json.loads(respuesta, parse_constant=rechazar)
+
+    def test_enviar_semana(self):
+        respuesta = self.atender({"id": 1, "op": "enviar_semana", "semana": "s1",
+                                  "temperaturas": [20, 22, None]})
+        self.assertTrue(respuesta["ok"])
+        self.assertEqual(respuesta["id"], 1)
+        self.assertEqual(respuesta["resultado"]["promedio"], 21)
+
+    def test_entero_enorme_responde_error(self):
+        respuesta = self.atender(f'{{"id": 2, "op": "enviar_semana", "semana": "s1", '
+                                 f'"temperaturas": [{10 ** 400}]}}')
+        self.assertFalse(respuesta["ok"])
+        self.assertEqual(respuesta["id"], 2)
+        # El servicio sigue atendiendo después del error
+        self.assertTrue(self.atender({"op": "metricas"})["ok"])
+
+    def test_valores_no_finitos_no_se_emiten(self):
+        linea = '{"id": 3, "op": "enviar_semana", "semana": "s1", "temperaturas": [Infinity, 20]}'
+        respuesta = self.decodificar_estricto(self.servicio.atender(linea))
+        self.assertFalse(respuesta["ok"])
+        self.assertEqual(respuesta["id"], 3)
+
+    def test_semana_no_finita_no_se_guarda(self):
+        self.atender({"op": "enviar_semana", "semana": "s1", "temperaturas": [20, 22]})
+        for linea in ('{"op": "enviar_semana", "semana": "s1", "temperaturas": [Infinity, 20]}',
+                      '{"op": "enviar_semana", "semana": "s1", "temperaturas": [1e308, 1e308]}',
+                      '{"op": "agregar_dia", "semana": "s1", "temperatura": "nan"}',
+                      '{"op": "agregar_dia", "semana": "s1", "temperatura": "-inf"}'):
+            self.assertFalse(self.decodificar_estricto(self.servicio.atender(linea))["ok"])
+        # La semana conserva los datos anteriores y se puede seguir resumiendo
+        respuesta = self.atender({"op": "resumen", "semana": "s1"})
+        self.assertTrue(respuesta["ok"])
+        self.assertEqual(respuesta["resultado"]["promedio"], 21)
+        self.assertEqual(len(respuesta["resultado"]["dias"]), 2)
+
+    def test_anidamiento_excesivo_responde_error(self):
+        respuesta = self.atender("[" * 100000)
+        self.assertFalse(respuesta["ok"])
+        self.assertTrue(self.atender({"op": "metricas"})["ok"])
+
+    def test_identificador_no_finito(self):
+        respuesta = self.decodificar_estricto(self.servicio.atender('{"id": NaN, "op": "desconocida"}'))
+        self.assertFalse(respuesta["ok"])
+        self.assertIsNone(respuesta["id"])
+
+
+if __name__ == "__main__":
+    unittest.main()